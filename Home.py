@@ -1,4 +1,5 @@
 import streamlit as st
+from utils.prewarm import start_prewarmer
 
 # --- Page Config: Tab Title & Icon ---
 st.set_page_config(
@@ -120,4 +121,5 @@ st.markdown(
     unsafe_allow_html=True
 )
 
-
+# --- Cache Pre-Warming: started by the first session of the server process, see utils.prewarm ---
+start_prewarmer()
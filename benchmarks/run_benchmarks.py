@@ -0,0 +1,186 @@
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+# --- Benchmark Settings ------------------------------------------------------------------------------------------------------------------------------
+PAGES = [
+    "pages/1_Transaction_Analysis.py",
+    "pages/2_User_Analysis.py",
+    "pages/3_Gas_Fee_Analysis.py",
+    "pages/4_Block_Analysis.py",
+]
+INTERACTION_TIMEFRAMES = ["week", "day"]  # each page is also re-run after switching its time frame to these
+PAGE_TIMEOUT = 900                        # seconds; a cold run on millions of rows builds every local store from scratch
+REGRESSION_FLOOR_S = 0.05                 # slowdowns smaller than this are noise, whatever the relative change
+
+
+# --- Page Runs ---------------------------------------------------------------------------------------------------------------------------------------
+def _reset_caches(cache_dir):
+    import streamlit as st
+
+    st.cache_data.clear()
+    st.cache_resource.clear()
+    shutil.rmtree(cache_dir, ignore_errors=True)
+    os.makedirs(cache_dir)
+
+
+def _run(app, action=None, trace_memory=False):
+    from utils.instrumentation import get_recorder
+
+    seen = len(get_recorder().records())
+    if trace_memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    if action is not None:
+        action(app)
+    app.run()
+    elapsed = time.perf_counter() - started
+    peak = None
+    if trace_memory:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    records = get_recorder().records()[seen:]
+    loaders = {record["name"]: {"cache": record["cache"], "seconds": round(record["total_s"], 4)}
+               for record in records if record["kind"] == "loader"}
+    return {
+        "seconds": round(elapsed, 4),
+        "peak_mb": round(peak / 2 ** 20, 1) if peak is not None else None,
+        "render_seconds": round(sum(record["total_s"] for record in records if record["kind"] == "render"), 4),
+        "loaders": loaders,
+        "exceptions": [str(exception.value) for exception in app.exception],
+    }
+
+
+def _new_app(page, data_dir, lazy=False):
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(os.path.join(REPO_ROOT, page), default_timeout=PAGE_TIMEOUT)
+    app.secrets["warehouse"] = {"backend": "duckdb", "parquet_dir": data_dir}
+    # -- AppTest has no viewport, so lazy sections are loaded eagerly except in the first-paint run
+    app.secrets["pages"] = {"lazy_sections": lazy}
+    # -- the pre-warmer would fill the caches the cold runs are meant to measure
+    app.secrets["prewarm"] = {"enabled": False}
+    return app
+
+
+def benchmark_page(page, data_dir, cache_dir):
+    result = {}
+
+    # -- memory: a separate cold run under tracemalloc, since tracing slows every allocation down
+    _reset_caches(cache_dir)
+    result["memory"] = _run(_new_app(page, data_dir), trace_memory=True)
+
+    # -- first paint: a cold run that only loads what is above the fold (lazy sections stay unloaded)
+    _reset_caches(cache_dir)
+    result["first_paint"] = _run(_new_app(page, data_dir, lazy=True))
+
+    _reset_caches(cache_dir)
+    app = _new_app(page, data_dir)
+    result["cold"] = _run(app)
+    result["warm"] = _run(app)
+    for timeframe in INTERACTION_TIMEFRAMES:
+        if app.selectbox and timeframe in app.selectbox[0].options:
+            result[timeframe] = _run(app, action=lambda app, timeframe=timeframe: app.selectbox[0].select(timeframe))
+    return result
+
+
+def cache_effectiveness(run):
+    loaders = run["loaders"].values()
+    if not loaders:
+        return None
+    return round(sum(loader["cache"] != "miss" for loader in loaders) / len(loaders), 3)
+
+
+# --- Reporting ---------------------------------------------------------------------------------------------------------------------------------------
+def print_report(results):
+    for page, result in results.items():
+        print(f"\n{page}")
+        print(f"  {'run':<11} {'latency s':>10} {'render s':>9} {'peak MB':>8} {'cache hits':>10}")
+        for phase in ["first_paint", "cold", "warm"] + INTERACTION_TIMEFRAMES:
+            if phase not in result:
+                continue
+            run = result[phase]
+            peak = result["memory"]["peak_mb"] if phase == "cold" else None
+            hits = cache_effectiveness(run)
+            print(f"  {phase:<11} {run['seconds']:>10.3f} {run['render_seconds']:>9.3f} "
+                  f"{peak if peak is not None else '':>8} {'' if hits is None else f'{hits:.0%}':>10}")
+            for exception in run["exceptions"]:
+                print(f"    EXCEPTION: {exception}")
+        print(f"  {'loader':<34} {'cold':>16} {'warm':>16}")
+        for name, cold in sorted(result["cold"]["loaders"].items(), key=lambda item: -item[1]["seconds"]):
+            warm = result["warm"]["loaders"].get(name, {"cache": "-", "seconds": 0.0})
+            print(f"  {name:<34} {cold['seconds']:>8.3f} {cold['cache']:>7} {warm['seconds']:>8.3f} {warm['cache']:>7}")
+
+
+def find_regressions(results, baseline, tolerance):
+    regressions = []
+    for page, result in results.items():
+        for phase, run in result.items():
+            before = baseline.get(page, {}).get(phase)
+            if phase == "memory" or before is None:
+                continue
+            if run["seconds"] > before["seconds"] * (1 + tolerance) and run["seconds"] - before["seconds"] > REGRESSION_FLOOR_S:
+                regressions.append(f"{page} [{phase}]: {before['seconds']:.3f}s -> {run['seconds']:.3f}s")
+        before_peak = baseline.get(page, {}).get("memory", {}).get("peak_mb")
+        peak = result["memory"]["peak_mb"]
+        if before_peak and peak > before_peak * (1 + tolerance):
+            regressions.append(f"{page} [memory]: {before_peak} MB -> {peak} MB")
+    return regressions
+
+
+# --- Entry Point -------------------------------------------------------------------------------------------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description="Run the dashboard pages on the DuckDB backend over synthetic Parquet exports.")
+    parser.add_argument("--data-dir", default=os.path.join(REPO_ROOT, ".cache", "benchmarks"),
+                        help="Parquet export directory (synthetic data is generated when missing)")
+    parser.add_argument("--txs", type=int, default=None, help="transactions to generate when the data is missing")
+    parser.add_argument("--pages", nargs="*", default=PAGES)
+    parser.add_argument("--json", help="write the results to this file (use it as the next --baseline)")
+    parser.add_argument("--baseline", help="results of a previous run; exit with status 1 on regressions")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative slowdown against the baseline")
+    args = parser.parse_args()
+
+    # -- every local store and result cache lives in a scratch directory, so runs never touch the app's own cache;
+    # -- it must be set before anything imports utils, which reads it at import time
+    cache_dir = tempfile.mkdtemp(prefix="axelar-bench-")
+    os.environ["AXELAR_CACHE_DIR"] = cache_dir
+    os.chdir(REPO_ROOT)
+
+    from benchmarks.synthetic_data import DEFAULT_TXS, exists, generate
+
+    data_dir = os.path.abspath(args.data_dir)
+    if not exists(data_dir):
+        print(f"Generating synthetic data in {data_dir} ...")
+        generate(data_dir, txs=args.txs or DEFAULT_TXS)
+
+    results = {}
+    try:
+        for page in args.pages:
+            results[page] = benchmark_page(page, data_dir, cache_dir)
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+    print_report(results)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    failed = any(run["exceptions"] for result in results.values() for run in result.values())
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = find_regressions(results, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        failed = failed or bool(regressions)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
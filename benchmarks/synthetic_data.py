@@ -0,0 +1,96 @@
+import argparse
+import glob
+import os
+import shutil
+import sys
+
+import duckdb
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.duckdb_backend import TABLES, table_glob
+
+# --- Synthetic Axelar Warehouse ----------------------------------------------------------------------------------------------------------------------
+# Builds axelar.core.fact_transactions and axelar.core.fact_blocks in a DuckDB file with Axelar-like shapes:
+#   - activity grows over time and follows a daily cycle
+#   - tx_from is heavy-tailed (a few bots send most transactions, most addresses send a handful)
+#   - ~5% of transactions fail, ~2% pay fees in a non-uaxl denom, fees and gas are log-normal
+# The tables are written in the DuckDB backend's export layout (<dir>/<table>/day=YYYY-MM-DD/*.parquet), so the benchmarks
+# exercise the same read path as a deployment on the Parquet exports.
+DEFAULT_TXS = 3_000_000
+DEFAULT_ADDRESSES = 300_000
+DEFAULT_BLOCKS = 600_000
+HISTORY_START = "2022-06-01"
+HISTORY_DAYS = 1200
+
+
+def exists(directory):
+    return all(glob.glob(table_glob(directory, table)) for table in TABLES)
+
+
+def generate(directory, txs=DEFAULT_TXS, addresses=DEFAULT_ADDRESSES, blocks=DEFAULT_BLOCKS,
+             start=HISTORY_START, days=HISTORY_DAYS, seed=0.42):
+    for table in TABLES:
+        shutil.rmtree(os.path.join(directory, table), ignore_errors=True)
+    os.makedirs(directory, exist_ok=True)
+    con = duckdb.connect()
+    con.execute(f"SELECT setseed({seed})")
+    con.execute("CREATE SCHEMA core")
+
+    # -- sqrt(random) skews timestamps towards the end of the history, a bit of hour-of-day skew on top
+    con.execute(f"""
+    CREATE TABLE core.fact_blocks AS
+    SELECT i AS block_id,
+           md5(i::varchar) AS fact_blocks_id,
+           TIMESTAMP '{start}' + to_seconds(CAST(sqrt(i / {blocks}) * {days} * 86400 AS BIGINT)) AS block_timestamp,
+           CAST(floor(exp(random() * 3 + random() * 2)) AS INTEGER) AS tx_count,
+           'validator' || CAST(floor(pow(random(), 2) * 75) AS INTEGER) AS validator_hash
+    FROM range({blocks}) t(i)
+    """)
+
+    con.execute(f"""
+    CREATE TABLE core.fact_transactions AS
+    WITH base AS (
+        SELECT i,
+               sqrt(random()) AS age,
+               random() AS hour_draw
+        FROM range({txs}) t(i)
+    )
+    SELECT md5('tx' || i::varchar) AS tx_id,
+           TIMESTAMP '{start}'
+               + to_days(CAST(floor(age * {days}) AS INTEGER))
+               + to_seconds(CAST(86400 * (hour_draw + 0.1 * sin(2 * pi() * hour_draw)) AS BIGINT)) AS block_timestamp,
+           CAST(floor({blocks} * age) AS BIGINT) AS block_id,
+           'axelar1' || md5(CAST(floor(pow(random(), 4) * {addresses}) AS BIGINT)::varchar) AS tx_from,
+           random() > 0.05 AS tx_succeeded,
+           CASE WHEN random() > 0.02 THEN 'uaxl' ELSE 'uusdc' END AS fee_denom,
+           CASE WHEN random() > 0.01 THEN round(exp(8 + random() * 2 + random())) ELSE 0 END AS fee,
+           CAST(exp(11 + random() * 1.5) AS BIGINT) AS gas_used,
+           CAST(exp(11.5 + random() * 1.5) AS BIGINT) AS gas_wanted
+    FROM base
+    """)
+    # -- one writer thread gives one file per day, like the export script
+    con.execute("SET threads TO 1")
+    for table, columns in TABLES.items():
+        con.execute(f"""
+        COPY (SELECT {", ".join(columns)}, block_timestamp::date AS day FROM core.{table})
+        TO '{os.path.join(directory, table)}' (FORMAT parquet, PARTITION_BY (day))
+        """)
+    counts = con.execute("""
+    SELECT (SELECT COUNT(*) FROM core.fact_transactions),
+           (SELECT COUNT(DISTINCT tx_from) FROM core.fact_transactions),
+           (SELECT COUNT(*) FROM core.fact_blocks)
+    """).fetchone()
+    con.close()
+    return counts
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic Axelar warehouse in DuckDB for the benchmarks.")
+    parser.add_argument("--dir", default=os.path.join(".cache", "benchmarks"), help="export directory to write")
+    parser.add_argument("--txs", type=int, default=DEFAULT_TXS)
+    parser.add_argument("--addresses", type=int, default=DEFAULT_ADDRESSES)
+    parser.add_argument("--blocks", type=int, default=DEFAULT_BLOCKS)
+    args = parser.parse_args()
+    n_txs, n_addresses, n_blocks = generate(args.dir, args.txs, args.addresses, args.blocks)
+    print(f"{args.dir}: {n_txs:,} transactions from {n_addresses:,} addresses, {n_blocks:,} blocks")
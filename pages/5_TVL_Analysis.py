@@ -1,7 +1,13 @@
 import streamlit as st
 import pandas as pd
-import requests
 import plotly.express as px
+from utils.http_client import HttpError, get_http_client
+from utils.instrumentation import instrumented, performance_panel, plotly_chart, start_page_run
+from utils.prewarm import register_warmup
+from utils.query_scheduler import QueryScheduler
+from utils.swr import stale_while_revalidate
+from utils.tvl import normalize_tvl
+from utils.tvl_history import get_tvl_history
 
 # --- Page Config: Tab Title & Icon ---
 st.set_page_config(
@@ -12,6 +18,7 @@ st.set_page_config(
 
 # --- Wide Layout ---
 st.set_page_config(layout="wide")
+start_page_run("TVL Analysis")
 
 # --- Sidebar Footer Slightly Left-Aligned ------------------------------------------------------------------------------------------------------------------
 st.sidebar.markdown(
@@ -62,57 +69,49 @@ st.title("Axelar Network: TVL Analysis💸")
 st.info("🔔To view the most recent updates, click on the '...' in the top-right corner of the page and select 'Rerun'.")
 
 # --------------------------------------------------------------------------------------------------------------------------------------------------
-# --- Load API Data ---
-@st.cache_data(ttl=3600)
+# --- Load API Data: both APIs are requested concurrently over the shared, pooled HTTP client ---
+# -- unchanged payloads come back as a 304 (see utils.http_client), so the loaders can afford a short max age; an expired
+# -- result is still served at once while a background thread refreshes it (see utils.swr), so a slow or failing API
+# -- only delays the very first load of a server that has no last good copy on disk
+AXELAR_TVL_URL = "https://api.axelarscan.io/api/getTVL"
+CHAINS_URL = "https://api.llama.fi/v2/chains"
+
+@instrumented
+@stale_while_revalidate(max_age=600)
 def load_axelar_api():
-    url = "https://api.axelarscan.io/api/getTVL"  
-    response = requests.get(url)
-    if response.status_code == 200:
-        return response.json()
-    else:
-        st.error(f"Failed to fetch API data: {response.status_code}")
-        return None
-
-data = load_axelar_api()
-
-# --- Parse Data ---
-if data and "data" in data:
-    rows = []
-    for asset in data["data"]:
-        asset_id = asset.get("asset", "")
-        price = asset.get("price", None)
-        total = asset.get("total", None)
-        value = asset.get("value", None)
-        asset_type = asset.get("assetType", "")
-        abnormal = asset.get("is_abnormal_supply", False)
-
-        tvl_data = asset.get("tvl", {})
-        for chain, details in tvl_data.items():
-            total_tvl = details.get("total", None)
-            rows.append({
-                "Asset ID": asset_id,
-                "Asset Type": asset_type,
-                "Chain": chain,
-                "Token Symbol": details.get("contract_data", {}).get("symbol") if "contract_data" in details else None,
-                "Token Name": details.get("contract_data", {}).get("name") if "contract_data" in details else None,
-                "Contract Address": details.get("contract_data", {}).get("contract_address") if "contract_data" in details else None,
-                "Gateway Address": details.get("gateway_address", None),
-                "Supply": details.get("supply", None),
-                "Total TVL": total_tvl,
-                "Price (USD)": price,
-                "TVL (USD)": round(total_tvl * price, 0) if total_tvl is not None and price is not None else None,
-                "Total Asset Value (USD)": value,
-                "Is Abnormal?": abnormal
-            })
-
-    df = pd.DataFrame(rows)
-
-    # --- Format Numbers ---
-    numeric_cols = ["Supply", "Total TVL", "Price (USD)", "TVL (USD)", "Total Asset Value (USD)"]
-    for col in numeric_cols:
-        df[col] = pd.to_numeric(df[col], errors="coerce")
-
-    # --- Display Table ---
+    df = normalize_tvl(get_http_client().get_json(AXELAR_TVL_URL))
+    # -- every fetch (including the pre-warmer's) is kept as a snapshot for the TVL Over Time charts
+    get_tvl_history().record(df)
+    return df
+
+@instrumented
+@stale_while_revalidate(max_age=600)
+def load_chains_api():
+    return get_http_client().get_json(CHAINS_URL)
+
+@instrumented
+@st.cache_data(ttl=600, show_spinner=False)
+def load_tvl_history(by):
+    return get_tvl_history().series(by)
+
+queries = QueryScheduler()
+queries.submit("axelar_api", load_axelar_api)
+queries.submit("chains_api", load_chains_api)
+
+def api_result(key, message, default):
+    # -- only reached when there is no last good copy yet; failures are not kept, the next run requests the API again
+    try:
+        return queries.result(key)
+    except HttpError as e:
+        st.error(f"{message}: {e}")
+        return default
+
+# --- Parse Data: one row per (asset, chain), normalized column-wise in the cached loader (see utils.tvl) ---
+df = api_result("axelar_api", "Failed to fetch API data", normalize_tvl(None))
+if df.empty:
+    st.warning("No data available from API.")
+
+# --- Display Table ---
 # --    st.dataframe(df.style.format({
 # --        "Supply": "{:,.2f}",
 # --        "Total TVL": "{:,.2f}",
@@ -120,8 +119,6 @@ if data and "data" in data:
 # --        "TVL (USD)": "{:,.0f}",
 # --        "Total Asset Value (USD)": "{:,.2f}"
 # --    }), use_container_width=True)
-else:
-    st.warning("No data available from API.")
 # ----------------------------------------------------------------------------------------------------------------------------------------------
 unique_assets = df.drop_duplicates(subset=["Asset ID"])
 total_axelar_tvl = unique_assets["Total Asset Value (USD)"].sum()
@@ -155,8 +152,6 @@ fig_asset_type = px.pie(
 fig_asset_type.update_traces(textposition="inside", textinfo="percent+label")
 fig_asset_type.update_layout(showlegend=True)
 
-df["TVL (USD)"] = (df["Total TVL"] * df["Price (USD)"]).round(0)
-
 chain_summary = df.groupby("Chain", as_index=False)["TVL (USD)"].sum()
 
 fig_chain = px.pie(
@@ -171,26 +166,33 @@ fig_chain.update_layout(showlegend=True)
 
 col1, col2 = st.columns(2)
 with col1:
-    st.plotly_chart(fig_asset_type, use_container_width=True)
+    plotly_chart(st, fig_asset_type, width="stretch")
 with col2:
-    st.plotly_chart(fig_chain, use_container_width=True)
+    plotly_chart(st, fig_chain, width="stretch")
+
+# --- TVL Over Time: read from the local snapshot history (see utils.tvl_history), never re-fetched from the API ---
+st.markdown("### TVL Over Time")
+history_by = st.radio("Group by", ["Chain", "Asset"], horizontal=True, key="tvl_history_by")
+tvl_history = load_tvl_history(history_by.lower())
+if len(tvl_history) < 2:
+    st.info("TVL history builds up from every fetch of the TVL API; the charts appear once two snapshots are recorded.")
+else:
+    top_groups = tvl_history.iloc[-1].nlargest(10).index
+    history_long = tvl_history[top_groups].reset_index().melt(id_vars="Date", var_name=history_by, value_name="TVL (USD)")
+    fig_history = px.line(history_long, x="Date", y="TVL (USD)", color=history_by, title=f"TVL Over Time by {history_by} (Top 10)")
+    fig_total = px.area(tvl_history.sum(axis=1).rename("TVL (USD)").reset_index(), x="Date", y="TVL (USD)",
+                        title=f"Total TVL Over Time (Sum over {history_by}s)")
+    col1, col2 = st.columns(2)
+    with col1:
+        plotly_chart(st, fig_history, width="stretch")
+    with col2:
+        plotly_chart(st, fig_total, width="stretch")
 # ------------------------------------------------------------------------------------------------------------------------------------------------
-# --- Load Chains API ---
-@st.cache_data(ttl=3600)
-def load_chains_api():
-    url = "https://api.llama.fi/v2/chains"
-    response = requests.get(url)
-    if response.status_code == 200:
-        return response.json()
-    else:
-        st.error(f"Failed to fetch Chains API: {response.status_code}")
-        return []
+# --- Chains API ---
+chains_data = api_result("chains_api", "Failed to fetch Chains API", [])
 
-chains_data = load_chains_api()
+chains_df = pd.DataFrame(chains_data, columns=["name", "tvl", "tokenSymbol"])
 
-chains_df = pd.DataFrame(chains_data)
-
-chains_df = chains_df[["name", "tvl", "tokenSymbol"]]
 chains_df.columns = ["Chain Name", "TVL (USD)", "Native Token Symbol"]
 
 chains_df = pd.concat([
@@ -211,7 +213,7 @@ st.dataframe(
     chains_df.style.format({
         "TVL (USD)": "{:,.0f}"
     }),
-    use_container_width=True
+    width="stretch"
 )
 
 # ----------------------------------------------------------------------------------------------------------------------------
@@ -245,4 +247,14 @@ fig_bar.update_layout(
     plot_bgcolor="white"
 )
 
-st.plotly_chart(fig_bar, use_container_width=True)
+plotly_chart(st, fig_bar, width="stretch")
+
+# --- Cache Pre-Warming: this page's loader calls for the default view, made exactly as above, for every time frame ---
+register_warmup("TVL Analysis", lambda start_date, end_date, timeframe: [
+    (load_axelar_api,),
+    (load_chains_api,),
+    (load_tvl_history, "chain"),
+])
+
+# --- Performance Panel (sidebar, off by default) ---
+performance_panel()
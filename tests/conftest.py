@@ -0,0 +1,38 @@
+import os
+import tempfile
+
+# -- every local store writes under the cache directory, which is read when utils.local_store is imported
+os.environ["AXELAR_CACHE_DIR"] = tempfile.mkdtemp(prefix="axelar-tests-")
+
+import pytest
+import streamlit as st
+
+import utils.snowflake_conn
+from benchmarks.synthetic_data import generate
+from utils.duckdb_backend import DuckDBBackend
+
+# --- Tiny Warehouse ----------------------------------------------------------------------------------------------------------------------------------
+# The benchmarks' synthetic Axelar tables at a few thousand rows, 90 closed days from 2022-06-01, served by the DuckDB
+# backend, so the stores are built by the same queries as in a deployment and can be compared with the original SQL.
+WAREHOUSE_START = "2022-06-01"
+WAREHOUSE_DAYS = 90
+
+
+@pytest.fixture(scope="session")
+def warehouse_dir(tmp_path_factory):
+    directory = str(tmp_path_factory.mktemp("warehouse"))
+    generate(directory, txs=30_000, addresses=2_000, blocks=6_000, start=WAREHOUSE_START, days=WAREHOUSE_DAYS)
+    return directory
+
+
+@pytest.fixture
+def warehouse(warehouse_dir, monkeypatch):
+    backend = DuckDBBackend(warehouse_dir)
+    monkeypatch.setattr(utils.snowflake_conn, "get_local_backend", lambda: backend)
+    return backend
+
+
+@pytest.fixture(autouse=True)
+def clear_cached_loaders():
+    # -- st.cache_data keys on a loader's source and arguments, so equal test loaders would share entries across tests
+    st.cache_data.clear()
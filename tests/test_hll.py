@@ -0,0 +1,43 @@
+import json
+
+import numpy as np
+import pytest
+
+from utils.duckdb_backend import _emulate_hll_export
+from utils.hll import HLL_RELATIVE_ERROR, HLL_REGISTERS, estimate, registers_from_export
+
+
+def _registers(values):
+    return registers_from_export(_emulate_hll_export(values))
+
+
+@pytest.mark.parametrize("n", [10, 300, 5_000, 50_000, 200_000])
+def test_estimate_within_four_standard_errors(n):
+    values = [f"axelar1{i:08d}" for i in range(n)]
+    assert abs(estimate(_registers(values)) - n) <= 4 * HLL_RELATIVE_ERROR * n
+
+
+def test_merged_registers_equal_the_sketch_of_the_union():
+    days = [[f"user{i}" for i in range(start, start + 4_000)] for start in range(0, 12_000, 2_000)]
+    merged = np.maximum.reduce([_registers(values) for values in days])
+    union = _registers({value for values in days for value in values})
+    np.testing.assert_array_equal(merged, union)
+    assert abs(estimate(merged) - 14_000) <= 4 * HLL_RELATIVE_ERROR * 14_000
+
+
+def test_estimates_a_stack_of_sketches_row_by_row():
+    stack = np.stack([_registers([f"u{i}" for i in range(n)]) for n in (100, 1_000, 10_000)])
+    np.testing.assert_allclose(estimate(stack), [estimate(row) for row in stack])
+
+
+def test_dense_and_sparse_exports_read_the_same():
+    sparse = _emulate_hll_export([f"u{i}" for i in range(2_000)])
+    registers = registers_from_export(sparse)
+    dense = json.dumps({"version": 4, "precision": 12, "dense": registers.tolist()})
+    np.testing.assert_array_equal(registers_from_export(dense), registers)
+    assert registers.shape == (HLL_REGISTERS,)
+
+
+def test_rejects_other_precisions():
+    with pytest.raises(ValueError):
+        registers_from_export({"version": 4, "precision": 14, "dense": [0] * 2 ** 14})
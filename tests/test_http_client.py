@@ -0,0 +1,76 @@
+import http.server
+import json
+import threading
+
+import pytest
+
+from utils.http_client import HttpClient
+
+PAYLOAD = {"data": [{"asset": "uaxl", "value": 1.5}]}
+ETAG = '"v1"'
+
+
+# --- A Local Server with ETags -----------------------------------------------------------------------------------------------------------------------
+class _Handler(http.server.BaseHTTPRequestHandler):
+    # -- answers 304 to a matching If-None-Match; with always_304 set it also answers 304 to any request that does not
+    # -- ask to bypass caches, like a cache in between that revalidated on its own
+    always_304 = False
+    requests = []
+
+    def do_GET(self):
+        type(self).requests.append(dict(self.headers))
+        revalidated = self.headers.get("If-None-Match") == ETAG
+        if revalidated or (self.always_304 and self.headers.get("Cache-Control") != "no-cache"):
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = json.dumps(PAYLOAD).encode("utf-8")
+        self.send_response(200)
+        self.send_header("ETag", ETAG)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    handler = type("Handler", (_Handler,), {"requests": []})
+    httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield handler, f"http://127.0.0.1:{httpd.server_port}/api/getTVL"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_an_unchanged_payload_is_served_from_the_kept_copy(server, tmp_path):
+    handler, url = server
+    client = HttpClient(str(tmp_path))
+    assert client.get_json(url) == PAYLOAD
+    assert client.get_json(url) == PAYLOAD
+    assert handler.requests[1]["If-None-Match"] == ETAG
+    assert client.stats() == {"requests": 2, "not_modified": 1, "downloads": 1, "bytes_downloaded": len(json.dumps(PAYLOAD))}
+
+
+def test_a_restarted_client_revalidates_with_the_copy_on_disk(server, tmp_path):
+    handler, url = server
+    HttpClient(str(tmp_path)).get_json(url)
+    restarted = HttpClient(str(tmp_path))
+    assert restarted.get_json(url) == PAYLOAD
+    assert restarted.stats()["not_modified"] == 1
+
+
+def test_a_304_without_a_kept_copy_fetches_the_full_payload(server, tmp_path):
+    handler, url = server
+    handler.always_304 = True
+    client = HttpClient(str(tmp_path))
+    assert client.get_json(url) == PAYLOAD
+    assert "If-None-Match" not in handler.requests[1]
+    assert client.stats()["downloads"] == 1
+    # -- the refetched payload is kept, so the next 304 is answered from it
+    assert client.get_json(url) == PAYLOAD
+    assert client.stats()["not_modified"] == 1
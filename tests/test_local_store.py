@@ -0,0 +1,99 @@
+import uuid
+
+import pandas as pd
+import streamlit as st
+
+from utils.instrumentation import instrumented
+from utils.local_store import IncrementalStore
+
+
+# --- A Store over an In-Memory Table -----------------------------------------------------------------------------------------------------------------
+class DailyCounts(IncrementalStore):
+    def __init__(self, rows):
+        self.name = f"test_daily_counts_{uuid.uuid4().hex}"
+        self.rows = rows
+        self.pulls = []
+        super().__init__()
+
+    def fetch(self, since):
+        self.pulls.append(pd.Timestamp(since))
+        return self.rows[self.rows["day"] >= pd.Timestamp(since)].copy()
+
+
+def _rows(*days):
+    return pd.DataFrame({"day": pd.to_datetime([day for day, _ in days]), "count": [count for _, count in days]})
+
+
+def _make_loader(store, calls):
+    # -- built the way a page defines its loaders, so every call makes new function objects with the same source
+    @instrumented
+    @st.cache_data(show_spinner=False)
+    def load_total(key):
+        calls.append(key)
+        return int(store.frame()["count"].sum())
+    return load_total
+
+
+def test_refresh_pulls_from_the_watermark_day_on():
+    store = DailyCounts(_rows(("2024-01-01", 1), ("2024-01-02", 2)))
+    store.refresh(force=True)
+    assert store.watermark == pd.Timestamp("2024-01-02")
+
+    # -- the watermark day was still open: it gets more rows, and a new day starts
+    store.rows = _rows(("2024-01-01", 1), ("2024-01-02", 5), ("2024-01-03", 7))
+    store.refresh(force=True)
+    assert store.pulls[-1] == pd.Timestamp("2024-01-02")
+    assert store.watermark == pd.Timestamp("2024-01-03")
+    assert store.frame().sort_values("day")["count"].tolist() == [1, 5, 7]
+
+
+def test_a_fresh_store_is_not_refreshed_again():
+    store = DailyCounts(_rows(("2024-01-01", 1)))
+    store.frame()
+    store.frame()
+    store.refresh()
+    assert len(store.pulls) == 1
+
+
+def test_a_store_reloads_its_table_from_disk():
+    store = DailyCounts(_rows(("2024-01-01", 1), ("2024-01-02", 2)))
+    store.refresh(force=True)
+    restarted = type(store).__new__(type(store))
+    restarted.name, restarted.rows, restarted.pulls = store.name, store.rows, []
+    IncrementalStore.__init__(restarted)
+    assert restarted.watermark == pd.Timestamp("2024-01-02")
+
+
+def test_a_refresh_with_new_rows_drops_the_registered_results():
+    store = DailyCounts(_rows(("2024-01-01", 1)))
+    calls = []
+    store.invalidate_on_update(_make_loader(store, calls))
+    assert _make_loader(store, calls)("a") == 1
+    assert _make_loader(store, calls)("a") == 1
+    assert calls == ["a"]
+
+    store.rows = _rows(("2024-01-01", 1), ("2024-01-02", 4))
+    store.refresh(force=True)
+    assert _make_loader(store, calls)("a") == 5
+    assert calls == ["a", "a"]
+
+
+def test_a_refresh_that_pulls_the_same_rows_keeps_the_registered_results():
+    store = DailyCounts(_rows(("2024-01-01", 1), ("2024-01-02", 2)))
+    calls = []
+    load_total = _make_loader(store, calls)
+    store.invalidate_on_update(load_total)
+    load_total("a")
+
+    # -- the watermark day is pulled again, in another row order, with nothing new in it
+    store.rows = store.rows.iloc[::-1]
+    store.refresh(force=True)
+    load_total("a")
+    assert calls == ["a"]
+
+
+def test_re_registering_a_loader_keeps_one_dependent():
+    store = DailyCounts(_rows(("2024-01-01", 1)))
+    for _ in range(3):
+        store.invalidate_on_update(_make_loader(store, []))
+    assert len(store._dependents) == 1
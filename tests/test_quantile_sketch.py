@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.quantile_sketch import SKETCH_GAMMA, quantile_label, sketch_quantiles
+
+RELATIVE_ERROR = (SKETCH_GAMMA - 1) / (SKETCH_GAMMA + 1)
+QS = [0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99]
+
+
+def _buckets(values):
+    # -- the same bucketing as bucket_sql
+    with np.errstate(divide="ignore"):
+        buckets = np.floor(np.log(values) / np.log(SKETCH_GAMMA))
+    return np.where(values > 0, buckets, -1)
+
+
+def _sketch(values, **columns):
+    rows = pd.DataFrame({"bucket": _buckets(values), "count": 1, **columns})
+    return rows.groupby([*columns, "bucket"], as_index=False)["count"].sum()
+
+
+def _exact(values, q):
+    # -- the value whose rank first reaches q of the total, which is what the sketch answers
+    ordered = np.sort(values)
+    return ordered[int(np.ceil(q * len(ordered))) - 1]
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_quantiles_within_relative_error(seed):
+    rng = np.random.default_rng(seed)
+    values = np.concatenate([np.zeros(50), rng.lognormal(9, 1.5, 20_000)])
+    quantiles = sketch_quantiles(_sketch(values), "bucket", "count", QS)
+    for q in QS:
+        estimate, exact = quantiles[quantile_label(q)], _exact(values, q)
+        assert abs(estimate - exact) <= RELATIVE_ERROR * estimate + 1e-9
+
+
+def test_merged_sketches_equal_the_sketch_of_all_values():
+    rng = np.random.default_rng(3)
+    days = [rng.lognormal(8, 1, 5_000) for _ in range(7)]
+    merged = pd.concat([_sketch(values) for values in days], ignore_index=True)
+    whole = _sketch(np.concatenate(days))
+    pd.testing.assert_series_equal(sketch_quantiles(merged, "bucket", "count", QS),
+                                   sketch_quantiles(whole, "bucket", "count", QS))
+
+
+def test_grouped_quantiles_match_each_group():
+    rng = np.random.default_rng(4)
+    groups = {"a": rng.lognormal(6, 1, 3_000), "b": rng.lognormal(12, 0.5, 3_000)}
+    rows = pd.concat([_sketch(values, group=name) for name, values in groups.items()], ignore_index=True)
+    quantiles = sketch_quantiles(rows, "bucket", "count", QS, by=["group"]).set_index("group")
+    for name, values in groups.items():
+        for q in QS:
+            estimate, exact = quantiles.loc[name, quantile_label(q)], _exact(values, q)
+            assert abs(estimate - exact) <= RELATIVE_ERROR * estimate
+
+
+def test_empty_sketch_has_no_quantiles():
+    rows = pd.DataFrame({"bucket": pd.Series(dtype=float), "count": pd.Series(dtype="int64")})
+    assert sketch_quantiles(rows, "bucket", "count", [0.5]).isna().all()
@@ -0,0 +1,244 @@
+import numpy as np
+import pandas as pd
+import pytest
+import streamlit as st
+
+from utils.address_stats import AddressStats
+from utils.block_rollup import bucket_blocks, block_totals, select_blocks, top_blocks_table, tx_count_classes
+from utils.first_seen import FirstSeenIndex
+from utils.hll import DailyUserSketches
+from utils.instrumentation import instrumented
+from utils.quantile_sketch import SKETCH_GAMMA
+from utils.tx_rollup import TxRollup, aggregate, fee_quantiles
+
+# -- inside the tiny warehouse's 90 days (see conftest), so the range cuts through the data on both sides
+START, END = "2022-06-20", "2022-08-10"
+
+
+def _sql(warehouse, query):
+    return warehouse.execute(query.format(start=START, end=END))
+
+
+# --- Address Stats -----------------------------------------------------------------------------------------------------------------------------------
+def test_top_users_match_the_original_query(warehouse):
+    expected = _sql(warehouse, """
+    SELECT tx_from AS "👨‍💻User",
+           MIN(block_timestamp::date) AS "📅Creation Date",
+           COUNT(DISTINCT tx_id) AS "⛓Transactions Count",
+           COUNT(DISTINCT block_timestamp::date) AS "📋# of Days of Activity",
+           ROUND((SUM(fee)/POW(10,6)), 2) AS "💸Total Fee Paid ($AXL)",
+           ROUND(AVG(gas_used), 2) AS "💨Average Gas Used"
+    FROM axelar.core.fact_transactions
+    WHERE tx_succeeded='true'
+      AND block_timestamp::date >= '{start}'
+      AND block_timestamp::date <= '{end}'
+      AND fee_denom = 'uaxl'
+    GROUP BY 1
+    """).sort_values("👨‍💻User").reset_index(drop=True)
+    actual = AddressStats().top_users(START, END, n=len(expected) + 1).sort_values("👨‍💻User").reset_index(drop=True)
+    # -- fee and gas are rounded floats on both sides, which may round a ...5 the other way; the counts must match exactly
+    pd.testing.assert_frame_equal(actual, expected, check_dtype=False, atol=0.011)
+
+
+def test_time_gap_classes_match_the_original_query(warehouse):
+    expected = _sql(warehouse, """
+    WITH tab1 AS (
+        SELECT tx_from AS user,
+               block_timestamp AS txs_date,
+               LAG(block_timestamp) OVER (PARTITION BY tx_from ORDER BY block_timestamp) AS Previous_transaction_date
+        FROM axelar.core.fact_transactions
+        WHERE block_timestamp::date >= '{start}'
+          AND block_timestamp::date <= '{end}'
+    ),
+    txs_time AS (
+        SELECT user, AVG(DATEDIFF(hour, Previous_transaction_date, txs_date)) AS avg_time_gap
+        FROM tab1
+        WHERE Previous_transaction_date IS NOT NULL
+        GROUP BY user
+    )
+    SELECT CASE
+        WHEN avg_time_gap <= 12 THEN 'TG <= 12 Hours'
+        WHEN avg_time_gap > 12 AND avg_time_gap <= 24 THEN '12 Hours < TG <= 1 Day'
+        WHEN avg_time_gap > 24 AND avg_time_gap <= 72 THEN '1 Day < TG <= 3 Days'
+        WHEN avg_time_gap > 72 AND avg_time_gap <= 168 THEN '3 Days < TG <= 1 Week'
+        WHEN avg_time_gap > 168 AND avg_time_gap <= 720 THEN '1 Week < TG <= 1 Month'
+        ELSE 'TG > 1 Month'
+    END AS "Avg Time Between TXs",
+    COUNT(DISTINCT user) AS "User Count"
+    FROM txs_time
+    GROUP BY 1
+    ORDER BY 1
+    """)
+    actual = AddressStats().time_gap_classes(START, END)
+    pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+
+
+def test_top_failed_match_the_original_query(warehouse):
+    expected = _sql(warehouse, """
+    SELECT tx_from AS "User",
+           COUNT(DISTINCT tx_id) AS "False Txns Count",
+           COUNT(DISTINCT block_timestamp::date) AS "Number of Days of Activity",
+           ROUND(COUNT(DISTINCT tx_id)::decimal / COUNT(DISTINCT block_timestamp::date), 2) AS "False Txns Count per Day"
+    FROM axelar.core.fact_transactions
+    WHERE tx_succeeded = 'FALSE'
+      AND block_timestamp::date >= '{start}'
+      AND block_timestamp::date <= '{end}'
+    GROUP BY 1
+    """).sort_values("User").reset_index(drop=True)
+    actual = AddressStats().top_failed(START, END, n=len(expected) + 1).sort_values("User").reset_index(drop=True)
+    pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+
+
+@pytest.mark.parametrize("timeframe", ["day", "week", "month"])
+def test_first_success_days_give_the_original_growth_chart(warehouse, timeframe):
+    expected = _sql(warehouse, f"""
+    WITH tab10 AS (
+        SELECT tx_from, MIN(block_timestamp::date) AS first_tx
+        FROM axelar.core.fact_transactions
+        WHERE tx_succeeded='true'
+          AND block_timestamp::date >= '{{start}}'
+          AND block_timestamp::date <= '{{end}}'
+        GROUP BY 1
+    )
+    SELECT date_trunc('{timeframe}', first_tx) AS "Date", COUNT(DISTINCT tx_from) AS "New Users"
+    FROM tab10
+    GROUP BY 1
+    ORDER BY 1
+    """)
+    first = AddressStats().first_success_days(START, END)
+    actual = first.groupby(first.dt.to_period({"day": "D", "week": "W-SUN", "month": "M"}[timeframe]).dt.start_time).size()
+    assert actual.index.tolist() == pd.to_datetime(expected["Date"]).tolist()
+    assert actual.tolist() == expected["New Users"].tolist()
+
+
+def test_extended_and_reused_range_totals_equal_a_fresh_build(warehouse):
+    stats = AddressStats()
+    stats.totals(START, "2022-07-15")
+    # -- moving the end forward folds in only the new days, asking again reuses the totals
+    extended = stats.totals(START, END)
+    reused = stats.totals(START, END)
+    fresh = AddressStats().totals(START, END)
+    for totals in (extended, reused):
+        pd.testing.assert_frame_equal(totals.sort_values("tx_from").reset_index(drop=True),
+                                      fresh.sort_values("tx_from").reset_index(drop=True), check_dtype=False)
+
+
+# --- Transaction Rollup ------------------------------------------------------------------------------------------------------------------------------
+def test_tx_rollup_totals_match_the_transactions(warehouse):
+    expected = _sql(warehouse, """
+    SELECT tx_succeeded,
+           COUNT(DISTINCT tx_id) AS tx_count,
+           SUM(fee) AS fee_sum,
+           MAX(fee) AS fee_max,
+           AVG(gas_used) AS gas_used_avg,
+           AVG(gas_wanted) AS gas_wanted_avg
+    FROM axelar.core.fact_transactions
+    WHERE block_timestamp::date >= '{start}'
+      AND block_timestamp::date <= '{end}'
+    GROUP BY 1
+    ORDER BY 1
+    """)
+    rollup = TxRollup()
+    actual = aggregate(rollup.select(START, END), by="tx_succeeded").sort_values("tx_succeeded").reset_index(drop=True)
+    pd.testing.assert_frame_equal(actual[expected.columns], expected, check_dtype=False)
+
+
+def test_tx_rollup_fee_quantiles_within_the_sketch_error(warehouse):
+    fees = np.sort(_sql(warehouse, """
+    SELECT fee FROM axelar.core.fact_transactions
+    WHERE block_timestamp::date >= '{start}' AND block_timestamp::date <= '{end}' AND fee IS NOT NULL
+    """)["fee"].to_numpy(dtype=float))
+    quantiles = fee_quantiles(TxRollup().select(START, END), [0.5, 0.9, 0.99])
+    for q, estimate in zip([0.5, 0.9, 0.99], quantiles):
+        exact = fees[int(np.ceil(q * len(fees))) - 1]
+        assert abs(estimate - exact) <= (SKETCH_GAMMA - 1) / (SKETCH_GAMMA + 1) * estimate
+
+
+# --- Block Rollup ------------------------------------------------------------------------------------------------------------------------------------
+def test_block_totals_match_the_original_query(warehouse):
+    expected = _sql(warehouse, """
+    SELECT COUNT(DISTINCT fact_blocks_id) AS "Blocks Count",
+           ROUND(AVG(tx_count)) AS "Average TX per Block"
+    FROM axelar.core.fact_blocks
+    WHERE block_timestamp::date >= '{start}'
+      AND block_timestamp::date <= '{end}'
+    """).iloc[0]
+    actual = block_totals(select_blocks(START, END))
+    assert actual["Blocks Count"] == expected["Blocks Count"]
+    assert actual["Average TX per Block"] == expected["Average TX per Block"]
+
+
+@pytest.mark.parametrize("timeframe", ["day", "week", "month"])
+def test_blocks_over_time_match_the_original_query(warehouse, timeframe):
+    date_col = "block_timestamp::date" if timeframe == "day" else f"date_trunc('{timeframe}', block_timestamp)"
+    expected = _sql(warehouse, f"""
+    SELECT {date_col} AS "Date",
+           COUNT(DISTINCT fact_blocks_id) AS "Blocks Count",
+           ROUND(AVG(tx_count)) AS "Average TX per Block",
+           COUNT(DISTINCT validator_hash) AS "Validator Count",
+           SUM(COUNT(DISTINCT fact_blocks_id)) OVER (ORDER BY {date_col} ASC) AS "Total Blocks Count"
+    FROM axelar.core.fact_blocks
+    WHERE block_timestamp::date >= '{{start}}'
+      AND block_timestamp::date <= '{{end}}'
+    GROUP BY 1
+    ORDER BY 1
+    """)
+    expected["Date"] = pd.to_datetime(expected["Date"])
+    actual = bucket_blocks(select_blocks(START, END), timeframe)
+    pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+
+
+def test_block_classes_and_top_blocks_match_the_original_queries(warehouse):
+    classes = _sql(warehouse, """
+    SELECT CASE
+               WHEN tx_count <= 5 THEN 'n<=5 TXs'
+               WHEN tx_count > 5 AND tx_count <= 10 THEN '5<n<=10 TXs'
+               WHEN tx_count > 10 AND tx_count <= 20 THEN '10<n<=20 TXs'
+               WHEN tx_count > 20 AND tx_count <= 50 THEN '20<n<=50 TXs'
+               WHEN tx_count > 50 AND tx_count <= 100 THEN '50<n<=100 TXs'
+               ELSE 'n>100 TXs'
+           END AS "Class",
+           COUNT(DISTINCT block_id) AS "Block Count"
+    FROM axelar.core.fact_blocks
+    WHERE block_timestamp::date >= '{start}'
+      AND block_timestamp::date <= '{end}'
+    GROUP BY 1
+    ORDER BY 1
+    """)
+    actual = tx_count_classes(select_blocks(START, END)).sort_values("Class").reset_index(drop=True)
+    pd.testing.assert_frame_equal(actual, classes, check_dtype=False)
+
+    # -- blocks with equal tx counts may come in any order from the original query, so only the counts are compared
+    top = _sql(warehouse, """
+    SELECT tx_count FROM axelar.core.fact_blocks
+    WHERE block_timestamp::date >= '{start}' AND block_timestamp::date <= '{end}'
+    ORDER BY 1 DESC
+    LIMIT 10
+    """)
+    actual_top = top_blocks_table(select_blocks(START, END, kind="top"))
+    assert actual_top["# of Transactions"].tolist() == top["tx_count"].tolist()
+
+
+# --- Refreshing an Unchanged Warehouse ---------------------------------------------------------------------------------------------------------------
+@pytest.mark.parametrize("store_class", [TxRollup, FirstSeenIndex, DailyUserSketches])
+def test_refreshing_an_unchanged_warehouse_keeps_dependent_results(warehouse, store_class):
+    built = store_class()
+    built.frame()
+    # -- a restarted server reads the table back from disk before its first refresh
+    store = store_class()
+    calls = []
+
+    @instrumented
+    @st.cache_data(show_spinner=False)
+    def load_row_count(name):
+        calls.append(name)
+        return len(store.frame())
+
+    store.invalidate_on_update(load_row_count)
+    watermark = store.watermark
+    load_row_count(store.name)
+    store.refresh(force=True)
+    store.refresh(force=True)
+    load_row_count(store.name)
+    assert store.watermark == watermark
+    assert calls == [store.name]
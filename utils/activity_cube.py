@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from utils.local_store import IncrementalStore
+from utils.query_templates import query_template, run_template
+
+# Same labels as CASE WHEN DAYOFWEEK(...)=0 THEN 7 ELSE DAYOFWEEK(...) END || ' - ' || DAYNAME(...): Monday is 1, Sunday 7
+WEEKDAY_LABELS = [f"{i} - {name}" for i, name in enumerate(["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"], start=1)]
+
+
+# --- Hour x Weekday Activity Cube of axelar.core.fact_transactions -----------------------------------------------------------------------------------
+# Transactions per (day, hour), materialized as a days x 24 array indexed by the offset from the first day. A transaction
+# falls in one hour, so counts add up over any range: the hour x weekday grid of a range is a slice of the array folded
+# onto 7 weekdays, with no GROUP BY over the range's transactions.
+HOURLY_TX_COUNTS = query_template("tx_hourly_counts", """
+    SELECT block_timestamp::date AS day,
+           DATE_PART('hour', block_timestamp) AS hour,
+           COUNT(DISTINCT tx_id) AS tx_count
+    FROM axelar.core.fact_transactions
+    WHERE block_timestamp::date >= :since
+    GROUP BY 1, 2
+    """)
+
+
+class ActivityCube(IncrementalStore):
+    name = "tx_hourly_cube"
+
+    def fetch(self, since):
+        df = run_template(HOURLY_TX_COUNTS, ttl=None, since=since)
+        df.columns = [column.lower() for column in df.columns]
+        return df
+
+    def _on_update(self):
+        if self._frame.empty:
+            self._cube = (None, np.zeros((0, 24), dtype=np.int64))
+            return
+        days = pd.DatetimeIndex(self._frame["day"])
+        first_day = days.min()
+        offsets = (days - first_day).days.to_numpy()
+        counts = np.zeros((offsets.max() + 1, 24), dtype=np.int64)
+        counts[offsets, self._frame["hour"].to_numpy(dtype=np.int64)] = self._frame["tx_count"].to_numpy()
+        self._cube = (first_day, counts)
+
+    def hour_weekday(self, start_date, end_date):
+        self.frame()
+        first_day, counts = self._cube
+        grid = np.zeros((7, 24), dtype=np.int64)
+        if first_day is not None:
+            lo = max((pd.Timestamp(start_date) - first_day).days, 0)
+            hi = min((pd.Timestamp(end_date) - first_day).days + 1, len(counts))
+            if lo < hi:
+                weekdays = (first_day.dayofweek + np.arange(lo, hi)) % 7
+                np.add.at(grid, weekdays, counts[lo:hi])
+        return pd.DataFrame(grid, index=pd.Index(WEEKDAY_LABELS, name="Day Name"), columns=pd.Index(range(24), name="Hour"))
+
+
+@st.cache_resource(show_spinner=False)
+def get_activity_cube():
+    return ActivityCube()
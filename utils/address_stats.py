@@ -0,0 +1,163 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from utils.instrumentation import record_local
+from utils.query_templates import query_template, run_template
+from utils.range_cache import OPEN_DAYS, DailyRangeCache
+
+MAX_RANGES = 8  # start dates whose per-address totals are kept in memory
+
+# Average time between an address's transactions, in hours
+TIME_GAP_BINS = [-np.inf, 12, 24, 72, 168, 720, np.inf]
+TIME_GAP_CLASSES = [
+    "TG <= 12 Hours",
+    "12 Hours < TG <= 1 Day",
+    "1 Day < TG <= 3 Days",
+    "3 Days < TG <= 1 Week",
+    "1 Week < TG <= 1 Month",
+    "TG > 1 Month",
+]
+
+
+# --- Per-Address Daily Stats of axelar.core.fact_transactions ----------------------------------------------------------------------------------------
+# One row per (day, tx_from) with the counters the leaderboards and the time-gap distribution are built from:
+#   tx_count, fee_sum, gas_used_sum/gas_used_count - successful uaxl transactions (the Top Users population)
+#   success_count                                  - successful transactions of any denom (first success in a range)
+#   failed_count                                   - failed transactions of any denom
+#   all_tx_count, first_hour, last_hour            - every transaction, with the hour index (hours since 1970) of the first/last one
+# "Days of activity" is a count of rows with a non-zero counter.
+DAILY_ADDRESS_STATS = query_template("tx_from_daily_stats", """
+    SELECT block_timestamp::date AS day,
+           tx_from,
+           COUNT(DISTINCT CASE WHEN tx_succeeded='true' AND fee_denom = 'uaxl' THEN tx_id END) AS tx_count,
+           SUM(CASE WHEN tx_succeeded='true' AND fee_denom = 'uaxl' THEN fee END) AS fee_sum,
+           SUM(CASE WHEN tx_succeeded='true' AND fee_denom = 'uaxl' THEN gas_used END) AS gas_used_sum,
+           COUNT(CASE WHEN tx_succeeded='true' AND fee_denom = 'uaxl' THEN gas_used END) AS gas_used_count,
+           COUNT(DISTINCT CASE WHEN tx_succeeded='true' THEN tx_id END) AS success_count,
+           COUNT(DISTINCT CASE WHEN tx_succeeded='false' THEN tx_id END) AS failed_count,
+           COUNT(*) AS all_tx_count,
+           DATEDIFF(hour, '1970-01-01'::timestamp, MIN(block_timestamp)) AS first_hour,
+           DATEDIFF(hour, '1970-01-01'::timestamp, MAX(block_timestamp)) AS last_hour
+    FROM axelar.core.fact_transactions
+    WHERE block_timestamp::date >= :first_day
+      AND block_timestamp::date <= :last_day
+    GROUP BY 1, 2
+    """)
+
+
+def fetch_address_days(first_day, last_day):
+    df = run_template(DAILY_ADDRESS_STATS, ttl=None, first_day=first_day, last_day=last_day)
+    df.columns = [column.lower() for column in df.columns]
+    return df
+
+
+def _sum_by_address(rows):
+    rows = rows.assign(
+        active_days=(rows["tx_count"] > 0).astype("int64"),
+        failed_days=(rows["failed_count"] > 0).astype("int64"),
+        first_day=rows["day"].where(rows["tx_count"] > 0),
+        first_success_day=rows["day"].where(rows["success_count"] > 0),
+    )
+    return _fold(rows)
+
+
+def _fold(rows):
+    return rows.groupby("tx_from", as_index=False).agg(
+        tx_count=("tx_count", "sum"),
+        active_days=("active_days", "sum"),
+        fee_sum=("fee_sum", "sum"),
+        gas_used_sum=("gas_used_sum", "sum"),
+        gas_used_count=("gas_used_count", "sum"),
+        failed_count=("failed_count", "sum"),
+        failed_days=("failed_days", "sum"),
+        first_day=("first_day", "min"),
+        first_success_day=("first_success_day", "min"),
+        all_tx_count=("all_tx_count", "sum"),
+        first_hour=("first_hour", "min"),
+        last_hour=("last_hour", "max"),
+    )
+
+
+# --- Address Stats -----------------------------------------------------------------------------------------------------------------------------------
+# Per-address totals of a range are kept per start date and only ever extended: moving end_date forward (or a new day
+# closing) folds the new days' rows into the totals instead of re-aggregating the range. Open days are added on top
+# of the closed totals on every call, since they may still change. The top N are then a partial selection (nlargest),
+# not a sort of every address.
+class AddressStats:
+    name = "tx_from_daily_stats_v3"
+
+    def __init__(self):
+        self._days = DailyRangeCache(self.name, fetch_address_days)
+        self._lock = threading.Lock()
+        self._ranges = OrderedDict()  # start -> (last closed day folded in, per-address totals)
+
+    def _closed_totals(self, start, closed_end):
+        with self._lock:
+            cached_end, totals = self._ranges.pop(start, (None, None))
+            if cached_end is None or closed_end < cached_end:
+                totals = _sum_by_address(self._days.get(start, closed_end))
+            elif closed_end > cached_end:
+                new = _sum_by_address(self._days.get(cached_end + pd.Timedelta(days=1), closed_end))
+                totals = _fold(pd.concat([totals, new], ignore_index=True))
+            self._ranges[start] = (closed_end, totals)
+            while len(self._ranges) > MAX_RANGES:
+                self._ranges.popitem(last=False)
+            return totals
+
+    def totals(self, start_date, end_date):
+        # -- reused totals never reach the daily cache, so the read is recorded here for every path
+        record_local(self.name)
+        start, end = pd.Timestamp(start_date), pd.Timestamp(end_date)
+        first_open_day = pd.Timestamp.today().normalize() - pd.Timedelta(days=OPEN_DAYS - 1)
+        closed_end = min(end, first_open_day - pd.Timedelta(days=1))
+        totals = self._closed_totals(start, closed_end) if closed_end >= start else None
+        if end >= first_open_day:
+            open_totals = _sum_by_address(self._days.get(max(start, first_open_day), end))
+            totals = open_totals if totals is None else _fold(pd.concat([totals, open_totals], ignore_index=True))
+        return totals if totals is not None else _sum_by_address(self._days.get(start, end))
+
+    def top_users(self, start_date, end_date, n=1000):
+        totals = self.totals(start_date, end_date)
+        top = totals[totals["tx_count"] > 0].nlargest(n, "tx_count")
+        return pd.DataFrame({
+            "👨‍💻User": top["tx_from"].to_numpy(),
+            "📅Creation Date": top["first_day"].dt.date.to_numpy(),
+            "⛓Transactions Count": top["tx_count"].to_numpy(),
+            "📋# of Days of Activity": top["active_days"].to_numpy(),
+            "💸Total Fee Paid ($AXL)": (top["fee_sum"] / pow(10, 6)).round(2).to_numpy(),
+            "💨Average Gas Used": (top["gas_used_sum"] / top["gas_used_count"]).round(2).to_numpy(),
+        })
+
+    def top_failed(self, start_date, end_date, n=10):
+        totals = self.totals(start_date, end_date)
+        top = totals[totals["failed_count"] > 0].nlargest(n, "failed_count")
+        return pd.DataFrame({
+            "User": top["tx_from"].to_numpy(),
+            "False Txns Count": top["failed_count"].to_numpy(),
+            "Number of Days of Activity": top["failed_days"].to_numpy(),
+            # -- rounded half up in integers, like ROUND on the query's decimal ratio (a float round goes half to even)
+            "False Txns Count per Day": ((200 * top["failed_count"] + top["failed_days"]) // (2 * top["failed_days"]) / 100).to_numpy(),
+        })
+
+    def first_success_days(self, start_date, end_date):
+        # -- the day of each address's first successful transaction inside the range, whatever it did before the range
+        return self.totals(start_date, end_date)["first_success_day"].dropna()
+
+    def time_gap_classes(self, start_date, end_date):
+        # -- DATEDIFF(hour, ...) counts hour boundaries, so the gaps between consecutive transactions telescope: their sum
+        # -- is last_hour - first_hour and there are all_tx_count - 1 of them, with no per-address sort of the transactions
+        totals = self.totals(start_date, end_date)
+        totals = totals[totals["all_tx_count"] > 1]
+        avg_time_gap = (totals["last_hour"] - totals["first_hour"]) / (totals["all_tx_count"] - 1)
+        classes = pd.cut(avg_time_gap, bins=TIME_GAP_BINS, labels=TIME_GAP_CLASSES).astype(str)
+        df = classes.value_counts().rename_axis("Avg Time Between TXs").reset_index(name="User Count")
+        return df.sort_values("Avg Time Between TXs").reset_index(drop=True)
+
+
+@st.cache_resource(show_spinner=False)
+def get_address_stats():
+    return AddressStats()
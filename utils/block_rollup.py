@@ -0,0 +1,103 @@
+import pandas as pd
+import streamlit as st
+
+from utils.local_store import truncate_dates
+from utils.query_templates import query_template, run_template
+from utils.range_cache import DailyRangeCache
+
+TOP_BLOCKS_PER_DAY = 10  # the page's top-N; the top N of any range is among the per-day top N of its days
+
+
+# --- Daily Block Rollup of axelar.core.fact_blocks ---------------------------------------------------------------------------------------------------
+# One windowed pass over the requested days produces two row sets, told apart by the `kind` column:
+#   "blocks" - one row per (day, validator_hash, tx_class) with additive block and tx counters
+#   "top"    - the TOP_BLOCKS_PER_DAY blocks of each day with the most transactions (block_id, fact_blocks_id, tx_sum = its tx_count)
+# Every Block Analysis chart (totals, time buckets, tx-count classes, top-N) is computed locally from these rows.
+BLOCK_DAYS = query_template("fact_blocks_daily_rollup", f"""
+    SELECT day,
+           validator_hash,
+           tx_class,
+           top_block_id AS block_id,
+           CASE WHEN GROUPING(top_block_id) = 1 THEN 'blocks' ELSE 'top' END AS kind,
+           MAX(fact_blocks_id) AS fact_blocks_id,
+           COUNT(DISTINCT fact_blocks_id) AS blocks_count,
+           SUM(tx_count) AS tx_sum,
+           COUNT(tx_count) AS tx_n
+    FROM (
+        SELECT block_timestamp::date AS day,
+               validator_hash,
+               fact_blocks_id,
+               tx_count,
+               CASE
+                   WHEN tx_count <= 5 THEN 'n<=5 TXs'
+                   WHEN tx_count > 5 AND tx_count <= 10 THEN '5<n<=10 TXs'
+                   WHEN tx_count > 10 AND tx_count <= 20 THEN '10<n<=20 TXs'
+                   WHEN tx_count > 20 AND tx_count <= 50 THEN '20<n<=50 TXs'
+                   WHEN tx_count > 50 AND tx_count <= 100 THEN '50<n<=100 TXs'
+                   ELSE 'n>100 TXs'
+               END AS tx_class,
+               CASE WHEN ROW_NUMBER() OVER (PARTITION BY block_timestamp::date ORDER BY tx_count DESC, block_id)
+                         <= {TOP_BLOCKS_PER_DAY} THEN block_id END AS top_block_id
+        FROM axelar.core.fact_blocks
+        WHERE block_timestamp::date >= :first_day
+          AND block_timestamp::date <= :last_day
+    )
+    GROUP BY GROUPING SETS ((day, validator_hash, tx_class), (day, top_block_id))
+    HAVING GROUPING(top_block_id) = 1 OR top_block_id IS NOT NULL
+    """)
+
+
+def fetch_block_days(first_day, last_day):
+    df = run_template(BLOCK_DAYS, ttl=None, first_day=first_day, last_day=last_day)
+    df.columns = [column.lower() for column in df.columns]
+    return df
+
+
+@st.cache_resource(show_spinner=False)
+def get_block_days():
+    return DailyRangeCache("fact_blocks_daily_rollup", fetch_block_days)
+
+
+def select_blocks(start_date, end_date, kind="blocks"):
+    df = get_block_days().get(start_date, end_date)
+    return df[df["kind"] == kind]
+
+
+# --- Aggregation Helpers (rows come from select_blocks(..., kind="blocks") unless noted) -------------------------------------------------------------
+def block_totals(rows):
+    sums = rows[["blocks_count", "tx_sum", "tx_n"]].sum()
+    return pd.Series({
+        "Blocks Count": int(sums["blocks_count"]),
+        "Average TX per Block": round(sums["tx_sum"] / sums["tx_n"]) if sums["tx_n"] else float("nan"),
+    }, dtype=object)
+
+
+def bucket_blocks(rows, timeframe):
+    rows = rows.assign(Date=truncate_dates(rows["day"], timeframe).values)
+    df = rows.groupby("Date", as_index=False).agg(
+        blocks_count=("blocks_count", "sum"),
+        tx_sum=("tx_sum", "sum"),
+        tx_n=("tx_n", "sum"),
+        validator_count=("validator_hash", "nunique"),
+    )
+    df["Blocks Count"] = df["blocks_count"]
+    df["Average TX per Block"] = (df["tx_sum"] / df["tx_n"]).round()
+    df["Validator Count"] = df["validator_count"]
+    df["Total Blocks Count"] = df["blocks_count"].cumsum()
+    return df[["Date", "Blocks Count", "Average TX per Block", "Validator Count", "Total Blocks Count"]]
+
+
+def tx_count_classes(rows):
+    df = rows.groupby("tx_class", as_index=False)["blocks_count"].sum()
+    return df.rename(columns={"tx_class": "Class", "blocks_count": "Block Count"})
+
+
+def top_blocks_table(top_rows, n=TOP_BLOCKS_PER_DAY):
+    # -- top_rows come from select_blocks(..., kind="top")
+    top = top_rows.sort_values(["tx_sum", "block_id"], ascending=[False, True]).head(n)
+    return pd.DataFrame({
+        "Block Number": top["block_id"].astype("int64").to_numpy(),
+        "Block ID": top["fact_blocks_id"].to_numpy(),
+        "# of Transactions": top["tx_sum"].astype("int64").to_numpy(),
+        "Block Creation Date": top["day"].dt.date.to_numpy(),
+    })
@@ -0,0 +1,111 @@
+import functools
+import glob
+import hashlib
+import json
+import os
+import re
+import time
+
+import duckdb
+
+from utils.instrumentation import record_query
+from utils.snowflake_conn import arrow_to_pandas
+
+# --- Exported Tables ---------------------------------------------------------------------------------------------------------------------------------
+# Parquet exports live in <parquet_dir>/<table>/day=YYYY-MM-DD/*.parquet, one folder per day, so a periodic export
+# (python -m utils.export_parquet) only rewrites the days that changed. Only the columns the pages read are exported.
+TABLES = {
+    "fact_transactions": [
+        "tx_id", "block_id", "block_timestamp", "tx_from", "tx_succeeded", "fee", "fee_denom", "gas_used", "gas_wanted",
+    ],
+    "fact_blocks": ["block_id", "fact_blocks_id", "block_timestamp", "tx_count", "validator_hash"],
+}
+
+
+def table_glob(parquet_dir, table):
+    return os.path.join(parquet_dir, table, "*", "*.parquet")
+
+
+# --- Snowflake -> DuckDB Dialect Shim ----------------------------------------------------------------------------------------------------------------
+# Only the constructs the pages actually use; everything else (::date casts, DATE_TRUNC, MEDIAN, DAYOFWEEK with Sunday = 0,
+# GROUPING SETS, LN/FLOOR, ILIKE on strings) already means the same thing in both engines.
+_REWRITES = [
+    # -- DATEDIFF(hour, a, b): DuckDB wants the date part as a string
+    (re.compile(r"DATEDIFF\(\s*(\w+)\s*,", re.IGNORECASE), r"DATEDIFF('\1',"),
+    # -- current_date - N: Snowflake subtracts days from a DATE, DuckDB needs an interval
+    (re.compile(r"current_date\s*-\s*(\d+)", re.IGNORECASE), r"(current_date - INTERVAL \1 DAY)"),
+    # -- DAYNAME returns 'Mon' in Snowflake and 'Monday' in DuckDB
+    (re.compile(r"DAYNAME\(([^()]*)\)", re.IGNORECASE), r"strftime(\1, '%a')"),
+    # -- ILIKE on a DATE_TRUNC result compares its text form in Snowflake
+    (re.compile(r"(DATE_TRUNC\('\w+',\s*\w+\))\s+ILIKE", re.IGNORECASE), r"CAST(\1 AS VARCHAR) ILIKE"),
+    # -- ::decimal is NUMBER(38, 0) in Snowflake; DuckDB's default DECIMAL(18, 3) would round differently
+    (re.compile(r"::decimal\b", re.IGNORECASE), "::DECIMAL(38, 0)"),
+    # -- HLL sketches are emulated client side from the distinct values, see _emulate_hll_export
+    (re.compile(r"HLL_EXPORT\(HLL_ACCUMULATE\((\w+)\)\)", re.IGNORECASE), r"LIST(DISTINCT \1)"),
+]
+_HLL_EXPORT = re.compile(r"HLL_EXPORT\(HLL_ACCUMULATE\(\w+\)\)\s+AS\s+(\w+)", re.IGNORECASE)
+
+
+# -- templates send the same canonical text over and over, so each distinct statement is only rewritten once
+@functools.lru_cache(maxsize=512)
+def translate(query):
+    for pattern, replacement in _REWRITES:
+        query = pattern.sub(replacement, query)
+    return query
+
+
+def _emulate_hll_export(values, precision=12):
+    # -- same register layout as HLL_EXPORT's sparse form; only the hash function differs from Snowflake's
+    registers = {}
+    suffix_bits = 64 - precision
+    for value in values:
+        hashed = int.from_bytes(hashlib.blake2b(str(value).encode(), digest_size=8).digest(), "big")
+        index = hashed >> suffix_bits
+        rank = suffix_bits - (hashed & ((1 << suffix_bits) - 1)).bit_length() + 1
+        registers[index] = max(registers.get(index, 0), rank)
+    return json.dumps({"version": 4, "precision": precision,
+                       "sparse": {"indices": list(registers), "maxLzCounts": list(registers.values())}})
+
+
+# --- DuckDB Backend ----------------------------------------------------------------------------------------------------------------------------------
+# Serves the pages' queries from the Parquet exports: axelar.core.<table> are views over the export folders, and the file
+# list is expanded on every query, so days written by the next export are picked up without a restart.
+class DuckDBBackend:
+    name = "duckdb"
+
+    def __init__(self, parquet_dir):
+        self._parquet_dir = parquet_dir
+        self._con = duckdb.connect()
+        self._con.execute("ATTACH ':memory:' AS axelar")
+        self._con.execute("CREATE SCHEMA axelar.core")
+        for table in TABLES:
+            if not glob.glob(table_glob(parquet_dir, table)):
+                raise FileNotFoundError(f"No Parquet export of {table} under {parquet_dir}; run python -m utils.export_parquet first")
+            self._con.execute(f"""
+            CREATE VIEW axelar.core.{table} AS
+            SELECT * FROM read_parquet('{table_glob(parquet_dir, table)}', hive_partitioning = false)
+            """)
+
+    def execute(self, query, params=None):
+        hll_columns = _HLL_EXPORT.findall(query)
+        started = time.perf_counter()
+        # -- a cursor per call gives every loader thread its own DuckDB connection to the same database
+        cursor = self._con.cursor()
+        try:
+            result = cursor.execute(translate(query), params)
+            executed = time.perf_counter()
+            table = result.fetch_arrow_table()
+            fetched = time.perf_counter()
+            df = arrow_to_pandas(table)
+        finally:
+            cursor.close()
+        for column in hll_columns:
+            df[column] = df[column].map(_emulate_hll_export)
+        record_query(
+            query_id=None,
+            rows=len(df),
+            execute_s=executed - started,
+            fetch_s=fetched - executed,
+            frame_build_s=time.perf_counter() - fetched,
+        )
+        return df
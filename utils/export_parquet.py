@@ -0,0 +1,66 @@
+import argparse
+import glob
+import os
+
+import pandas as pd
+
+from utils.duckdb_backend import TABLES
+from utils.local_store import write_parquet_atomic
+from utils.query_templates import query_template
+from utils.range_cache import OPEN_DAYS
+from utils.snowflake_conn import execute_uncached
+
+# --- Parquet Export of the Warehouse Tables (feeds the DuckDB backend) -------------------------------------------------------------------------------
+# Run periodically, e.g. hourly from cron:  python -m utils.export_parquet --dir /data/axelar-exports
+# Each run re-exports the last OPEN_DAYS exported days (they may still have been filling up) and every day after them,
+# CHUNK_DAYS days per query; each day is written atomically to <dir>/<table>/day=YYYY-MM-DD/data.parquet.
+# Snowflake credentials come from .streamlit/secrets.toml like for the app.
+CHUNK_DAYS = 7
+
+# -- table and column list are template fragments, the day range is bound
+TABLE_NAMES = {table: f"axelar.core.{table}" for table in TABLES}
+EXPORT_FIRST_DAY = query_template("export_first_day", "SELECT MIN(block_timestamp)::date AS first_day FROM {table}", table=TABLE_NAMES)
+EXPORT_DAYS = query_template("export_days", """
+    SELECT {columns}
+    FROM {table}
+    WHERE block_timestamp::date >= :first_day
+      AND block_timestamp::date <= :last_day
+    """, table=TABLE_NAMES, columns={table: ", ".join(columns) for table, columns in TABLES.items()})
+
+
+def exported_days(parquet_dir, table):
+    folders = glob.glob(os.path.join(parquet_dir, table, "day=*"))
+    return sorted(pd.Timestamp(os.path.basename(folder)[len("day="):]) for folder in folders)
+
+
+def _first_day(table):
+    df = execute_uncached(*EXPORT_FIRST_DAY.bind(table=table))
+    return pd.Timestamp(df.iloc[0, 0])
+
+
+def export_table(parquet_dir, table):
+    days = exported_days(parquet_dir, table)
+    since = days[-OPEN_DAYS] if len(days) >= OPEN_DAYS else _first_day(table)
+    today = pd.Timestamp.today().normalize()
+    written = 0
+    for chunk_start in pd.date_range(since, today, freq=f"{CHUNK_DAYS}D"):
+        chunk_end = min(chunk_start + pd.Timedelta(days=CHUNK_DAYS - 1), today)
+        df = execute_uncached(*EXPORT_DAYS.bind(table=table, columns=table,
+                                                first_day=chunk_start.date(), last_day=chunk_end.date()))
+        df.columns = [column.lower() for column in df.columns]
+        for day, rows in df.groupby(pd.to_datetime(df["block_timestamp"]).dt.normalize()):
+            folder = os.path.join(parquet_dir, table, f"day={day.date()}")
+            os.makedirs(folder, exist_ok=True)
+            write_parquet_atomic(rows, os.path.join(folder, "data.parquet"))
+            written += 1
+    return since, written
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export the Axelar tables the dashboard reads to day-partitioned Parquet.")
+    parser.add_argument("--dir", required=True, help="export directory, the parquet_dir of the DuckDB backend")
+    parser.add_argument("--tables", nargs="*", default=list(TABLES))
+    args = parser.parse_args()
+    for table in args.tables:
+        since, written = export_table(args.dir, table)
+        print(f"{table}: wrote {written} day partitions from {since.date()}")
@@ -0,0 +1,116 @@
+import collections
+import hashlib
+import json
+import threading
+import types
+
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+# --- Figure Cache Settings ---------------------------------------------------------------------------------------------------------------------------
+FIGURE_CACHE_MAX_BYTES = 64 * 1024 * 1024   # serialized figure JSON kept per server process; least recently used figures go first
+
+
+# --- Cache Keys --------------------------------------------------------------------------------------------------------------------------------------
+# A figure is keyed by its builder (the compiled code, so editing a builder invalidates its figures) and by the content of
+# the builder's arguments: DataFrames and Series by a hash of their values, index and dtypes, anything else by its repr.
+# Builders must depend on their arguments only, not on page globals.
+def _code_digest(code, digest):
+    digest.update(code.co_code)
+    digest.update(repr(code.co_names).encode("utf-8"))
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            _code_digest(const, digest)
+        else:
+            digest.update(repr(const).encode("utf-8"))
+
+
+def _content_digest(value, digest):
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        frame = value.to_frame() if isinstance(value, pd.Series) else value
+        digest.update(repr((type(value).__name__, list(frame.columns), [str(dtype) for dtype in frame.dtypes])).encode("utf-8"))
+        try:
+            hashed = pd.util.hash_pandas_object(value, index=True)
+        except TypeError:
+            # -- unhashable cells (lists, dicts): hash their text instead
+            hashed = pd.util.hash_pandas_object(value.astype(str), index=True)
+        digest.update(hashed.to_numpy().tobytes())
+    elif isinstance(value, (list, tuple)):
+        digest.update(f"{type(value).__name__}{len(value)}".encode("utf-8"))
+        for item in value:
+            _content_digest(item, digest)
+    else:
+        digest.update(repr(value).encode("utf-8"))
+
+
+def figure_key(build, *args):
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{build.__module__}.{build.__qualname__}".encode("utf-8"))
+    _code_digest(build.__code__, digest)
+    _content_digest(args, digest)
+    return digest.hexdigest()
+
+
+# --- Figure Cache (one per server process, shared by every session) ---------------------------------------------------------------------------------
+# Holds the JSON of built figures, bounded by total size with least-recently-used eviction. A hit is turned back into a
+# go.Figure without validation (the JSON came from a validated figure), about 25x cheaper than building it with px / go
+# again, and every hit gets its own Figure, so a page may still modify what it gets back.
+class FigureCache:
+    def __init__(self, max_bytes=FIGURE_CACHE_MAX_BYTES):
+        self._max_bytes = max_bytes
+        self._entries = collections.OrderedDict()   # key -> (is_list, [figure JSON, ...])
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+        is_list, specs = entry
+        figures = [go.Figure(json.loads(spec), _validate=False) for spec in specs]
+        return figures if is_list else figures[0]
+
+    def put(self, key, result):
+        figures = result if isinstance(result, list) else [result]
+        if not figures or not all(isinstance(figure, go.Figure) for figure in figures):
+            # -- tables and messages are cheap to build again
+            return
+        specs = [figure.to_json() for figure in figures]
+        size = sum(len(spec) for spec in specs)
+        if size > self._max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = (isinstance(result, list), specs)
+            self._bytes += size
+            while self._bytes > self._max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= sum(len(spec) for spec in evicted)
+                self._stats["evictions"] += 1
+
+    def stats(self):
+        with self._lock:
+            return {**self._stats, "figures": len(self._entries), "bytes": self._bytes}
+
+
+@st.cache_resource(show_spinner=False)
+def get_figure_cache():
+    return FigureCache()
+
+
+def cached_figure(build, *args):
+    # -- build(*args) returns a figure or a list of figures; anything else is returned as built and not cached
+    cache = get_figure_cache()
+    key = figure_key(build, *args)
+    figure = cache.get(key)
+    if figure is None:
+        figure = build(*args)
+        cache.put(key, figure)
+    return figure
@@ -0,0 +1,63 @@
+import pandas as pd
+import streamlit as st
+
+from utils.local_store import IncrementalStore, truncate_dates
+from utils.query_templates import query_template, run_template
+
+
+# --- First-Seen Index: one row per address with its first transaction (any status / succeeded only) and last activity day ---------------------------
+# Refreshes only scan days from the last ingested day onward and fold them in with min/max, so the full-history
+# MIN(block_timestamp) GROUP BY tx_from scan runs once instead of on every new-user chart.
+FIRST_SEEN = query_template("address_first_seen", """
+    SELECT tx_from,
+           MIN(block_timestamp::date) AS first_tx,
+           MIN(CASE WHEN tx_succeeded='true' THEN block_timestamp::date END) AS first_success_tx,
+           MAX(block_timestamp::date) AS last_tx
+    FROM axelar.core.fact_transactions
+    WHERE block_timestamp::date >= :since
+    GROUP BY 1
+    """)
+
+
+class FirstSeenIndex(IncrementalStore):
+    name = "address_first_seen"
+    date_column = "last_tx"
+
+    def fetch(self, since):
+        df = run_template(FIRST_SEEN, ttl=None, since=since)
+        df.columns = [column.lower() for column in df.columns]
+        df["first_tx"] = pd.to_datetime(df["first_tx"])
+        df["first_success_tx"] = pd.to_datetime(df["first_success_tx"])
+        return df
+
+    def merge(self, old, new, since):
+        if old is None:
+            return new
+        return (
+            pd.concat([old, new], ignore_index=True)
+            .groupby("tx_from", as_index=False)
+            .agg(first_tx=("first_tx", "min"), first_success_tx=("first_success_tx", "min"), last_tx=("last_tx", "max"))
+        )
+
+
+@st.cache_resource(show_spinner=False)
+def get_first_seen_index():
+    return FirstSeenIndex()
+
+
+# --- Lookups -----------------------------------------------------------------------------------------------------------------------------------------
+def new_users(timeframe, start_date=None, end_date=None, succeeded_only=True):
+    first_column = "first_success_tx" if succeeded_only else "first_tx"
+    first = get_first_seen_index().frame()[first_column].dropna()
+    if start_date is not None:
+        first = first[first >= pd.Timestamp(start_date)]
+    if end_date is not None:
+        first = first[first <= pd.Timestamp(end_date)]
+    df = truncate_dates(first, timeframe).value_counts().sort_index().rename_axis("Date").reset_index(name="New Users")
+    return df
+
+
+def first_tx_dates(addresses, succeeded_only=False):
+    first_column = "first_success_tx" if succeeded_only else "first_tx"
+    index = get_first_seen_index().frame().set_index("tx_from")[first_column]
+    return pd.Series(addresses).map(index)
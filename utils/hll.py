@@ -0,0 +1,96 @@
+import json
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from utils.local_store import IncrementalStore, truncate_dates
+from utils.query_templates import query_template, run_template
+
+# --- HyperLogLog Registers ---------------------------------------------------------------------------------------------------------------------------
+# Snowflake's HLL_ACCUMULATE keeps 2^12 registers; merging two sketches is an element-wise max of their registers, so per-day
+# sketches answer any date range or week/month bucket. The standard error of an estimate is 1.04 / sqrt(2^12), ~1.6%.
+HLL_PRECISION = 12
+HLL_REGISTERS = 2 ** HLL_PRECISION
+HLL_RELATIVE_ERROR = 1.04 / np.sqrt(HLL_REGISTERS)
+
+
+def registers_from_export(sketch):
+    # -- sketch is the output of HLL_EXPORT: {"version": 4, "precision": 12, "dense": [...]} or "sparse": {"indices", "maxLzCounts"}
+    if isinstance(sketch, str):
+        sketch = json.loads(sketch)
+    if sketch["precision"] != HLL_PRECISION:
+        raise ValueError(f"Unsupported HLL precision {sketch['precision']}, expected {HLL_PRECISION}")
+    registers = np.zeros(HLL_REGISTERS, dtype=np.uint8)
+    if "dense" in sketch:
+        registers[:] = sketch["dense"]
+    else:
+        registers[sketch["sparse"]["indices"]] = sketch["sparse"]["maxLzCounts"]
+    return registers
+
+
+def estimate(registers):
+    # -- works on one register array or on a 2-D stack of them (one estimate per row)
+    registers = np.asarray(registers, dtype=np.float64)
+    m = registers.shape[-1]
+    alpha = 0.7213 / (1 + 1.079 / m)
+    raw = alpha * m * m / np.power(2.0, -registers).sum(axis=-1)
+    zeros = (registers == 0).sum(axis=-1)
+    # -- small cardinalities: linear counting over the empty registers is more accurate
+    linear = m * np.log(m / np.maximum(zeros, 1))
+    return np.where((raw <= 2.5 * m) & (zeros > 0), linear, raw)
+
+
+# --- Daily User Sketches -----------------------------------------------------------------------------------------------------------------------------
+# One HLL sketch of tx_from per day over successful transactions (the population every user metric is defined on).
+# Distinct tx_id counts need no sketch: a transaction belongs to a single day, so the exact per-day counts in the
+# transaction rollup already add up over any range.
+DAILY_USER_SKETCHES = query_template("tx_from_hll_daily", """
+    SELECT block_timestamp::date AS day,
+           HLL_EXPORT(HLL_ACCUMULATE(tx_from)) AS sketch
+    FROM axelar.core.fact_transactions
+    WHERE tx_succeeded='true'
+      AND block_timestamp::date >= :since
+    GROUP BY 1
+    """)
+
+
+class DailyUserSketches(IncrementalStore):
+    name = "tx_from_hll_daily"
+
+    def fetch(self, since):
+        df = run_template(DAILY_USER_SKETCHES, ttl=None, since=since)
+        df.columns = [column.lower() for column in df.columns]
+        df["registers"] = [registers_from_export(sketch).tobytes() for sketch in df.pop("sketch")]
+        return df
+
+    def _on_update(self):
+        df = self._frame.sort_values("day")
+        registers = np.frombuffer(b"".join(df["registers"]), dtype=np.uint8).reshape(len(df), HLL_REGISTERS)
+        self._matrix = (pd.DatetimeIndex(df["day"]), registers)
+
+    def _days(self, start_date, end_date):
+        self.frame()
+        days, registers = self._matrix
+        mask = (days >= pd.Timestamp(start_date)) & (days <= pd.Timestamp(end_date))
+        return days[mask], registers[mask]
+
+    def distinct(self, start_date, end_date):
+        days, registers = self._days(start_date, end_date)
+        if len(days) == 0:
+            return 0.0
+        return float(estimate(registers.max(axis=0)))
+
+    def distinct_by(self, timeframe, start_date, end_date):
+        days, registers = self._days(start_date, end_date)
+        buckets = truncate_dates(days, timeframe).to_numpy()
+        if len(buckets) == 0:
+            return pd.DataFrame({"Date": pd.to_datetime([]), "estimate": []})
+        starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+        merged = np.maximum.reduceat(registers, starts, axis=0)
+        return pd.DataFrame({"Date": buckets[starts], "estimate": estimate(merged)})
+
+
+@st.cache_resource(show_spinner=False)
+def get_user_sketches():
+    return DailyUserSketches()
@@ -0,0 +1,121 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+import requests
+import streamlit as st
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from utils.instrumentation import record_query
+from utils.local_store import CACHE_DIR
+
+# --- HTTP Client Settings ----------------------------------------------------------------------------------------------------------------------------
+HTTP_TIMEOUT = (5, 30)      # seconds: (connect, read) per attempt
+HTTP_RETRIES = 3            # retries on connection errors, 429 and 5xx, with exponential backoff honouring Retry-After
+HTTP_BACKOFF = 0.5          # seconds; waits 0.5, 1, 2 between retries
+HTTP_POOL_SIZE = 8          # keep-alive connections kept per host, like the worker pool that runs the page loaders
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# -- what get_json raises once the retries are used up (connection errors, timeouts, error statuses); callers catch this
+# -- instead of depending on the HTTP library
+HttpError = requests.RequestException
+
+
+# --- Conditional HTTP Client (one per server process, shared by every session) ----------------------------------------------------------------------
+# Every JSON response is kept with its ETag / Last-Modified validators, in memory and on disk (so they survive a restart),
+# and later requests for the same URL send If-None-Match / If-Modified-Since: an unchanged payload costs a 304 with an
+# empty body, and the kept, already parsed payload is returned without downloading or parsing the JSON again.
+class HttpClient:
+    def __init__(self, directory, timeout=HTTP_TIMEOUT, retries=HTTP_RETRIES, pool_size=HTTP_POOL_SIZE):
+        self._directory = directory
+        self._timeout = timeout
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._stats = {"requests": 0, "not_modified": 0, "downloads": 0, "bytes_downloaded": 0}
+        os.makedirs(directory, exist_ok=True)
+
+        retry = Retry(total=retries, backoff_factor=HTTP_BACKOFF, status_forcelist=RETRY_STATUSES,
+                      allowed_methods=frozenset({"GET"}), respect_retry_after_header=True, raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, max_retries=retry)
+        self._session = requests.Session()
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
+    def _path(self, url):
+        return os.path.join(self._directory, f"{hashlib.sha256(url.encode('utf-8')).hexdigest()}.json")
+
+    def _entry(self, url):
+        with self._lock:
+            entry = self._entries.get(url)
+        if entry is not None:
+            return entry
+        try:
+            with open(self._path(url)) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            # -- no entry yet, or a half-written one: fetch unconditionally
+            return None
+        with self._lock:
+            return self._entries.setdefault(url, entry)
+
+    def _store(self, url, entry):
+        with self._lock:
+            self._entries[url] = entry
+        path = self._path(url)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, path)
+
+    def _get(self, url, headers):
+        started = time.perf_counter()
+        response = self._session.get(url, headers=headers, timeout=self._timeout)
+        with self._lock:
+            self._stats["requests"] += 1
+        return response, time.perf_counter() - started
+
+    def get_json(self, url):
+        entry = self._entry(url)
+        headers = {}
+        if entry is not None:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        response, elapsed = self._get(url, headers)
+        if response.status_code == 304:
+            if entry is not None:
+                with self._lock:
+                    self._stats["not_modified"] += 1
+                record_query(result_cache=True, execute_s=elapsed)
+                return entry["payload"]
+            # -- nothing kept to answer a 304 with (e.g. a cache in between revalidated on its own): ask for the full payload
+            response, elapsed = self._get(url, {"Cache-Control": "no-cache"})
+
+        response.raise_for_status()
+        started = time.perf_counter()
+        payload = response.json()
+        record_query(execute_s=elapsed, frame_build_s=time.perf_counter() - started)
+        with self._lock:
+            self._stats["downloads"] += 1
+            self._stats["bytes_downloaded"] += len(response.content)
+        if response.headers.get("ETag") or response.headers.get("Last-Modified"):
+            self._store(url, {
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "payload": payload,
+            })
+        return payload
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats)
+
+
+@st.cache_resource(show_spinner=False)
+def get_http_client():
+    return HttpClient(os.path.join(CACHE_DIR, "http"))
@@ -0,0 +1,254 @@
+import base64
+import functools
+import json
+import os
+import threading
+import time
+import uuid
+from collections import deque
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+# --- Instrumentation Settings ------------------------------------------------------------------------------------------------------------------------
+MAX_RECORDS = 5000                                  # records kept in memory per server process for the panel and exports
+PERF_LOG_PATH = os.environ.get("AXELAR_PERF_LOG")   # when set, every record is also appended to this JSONL file
+
+_local = threading.local()
+
+
+# --- Recorder (one per server process) ---------------------------------------------------------------------------------------------------------------
+class Recorder:
+    def __init__(self, max_records=MAX_RECORDS, log_path=PERF_LOG_PATH):
+        self._records = deque(maxlen=max_records)
+        self._lock = threading.Lock()
+        self._log_path = log_path
+
+    def add(self, record):
+        with self._lock:
+            self._records.append(record)
+            if self._log_path:
+                with open(self._log_path, "a") as f:
+                    f.write(json.dumps(record, default=str) + "\n")
+
+    def records(self, **match):
+        with self._lock:
+            records = list(self._records)
+        return [record for record in records if all(record.get(key) == value for key, value in match.items())]
+
+
+@st.cache_resource(show_spinner=False)
+def get_recorder():
+    return Recorder()
+
+
+# --- Page Runs ---------------------------------------------------------------------------------------------------------------------------------------
+# Every record is tagged with the session and the page run it belongs to, so the panel can break down one page load.
+def start_page_run(page):
+    st.session_state["_perf_run"] = {"run_id": uuid.uuid4().hex, "page": page, "started": time.perf_counter()}
+
+
+def _current_run():
+    ctx = get_script_run_ctx()
+    if ctx is None:
+        return None, {"run_id": None, "page": "background"}
+    try:
+        run = st.session_state.get("_perf_run")
+    except Exception:
+        run = None
+    return ctx.session_id, run or {"run_id": None, "page": None}
+
+
+def _new_record(kind, name):
+    session_id, run = _current_run()
+    return {
+        "ts": time.time(),
+        "session": session_id,
+        "run_id": run["run_id"],
+        "page": run["page"],
+        "kind": kind,
+        "name": name,
+    }
+
+
+# --- Loader Instrumentation --------------------------------------------------------------------------------------------------------------------------
+# Put @instrumented above @st.cache_data: the wrapper then also sees calls answered from Streamlit's memory cache.
+# While a loader runs, run_query and the local stores report into its record through a thread-local, which is how
+# the record tells a warehouse miss from a disk result-cache hit, a local-store answer or a memory-cache hit.
+def instrumented(fn):
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        record = _new_record("loader", fn.__name__)
+        record.update(queries=[], local_stores=[], error=None)
+        parent = getattr(_local, "record", None)
+        _local.record = record
+        started = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        except Exception as e:
+            record["error"] = repr(e)
+            raise
+        finally:
+            record["total_s"] = time.perf_counter() - started
+            _local.record = parent
+            _finish_loader(record)
+    return wrapper
+
+
+def _finish_loader(record):
+    queries = record["queries"]
+    warehouse = [query for query in queries if not query["result_cache"]]
+    if warehouse:
+        record["cache"] = "miss"
+    elif queries:
+        record["cache"] = "result-cache"
+    elif record["local_stores"]:
+        record["cache"] = "local"
+    else:
+        record["cache"] = "memory"
+    for stage in ["checkout_wait_s", "execute_s", "fetch_s", "frame_build_s"]:
+        record[stage] = sum(query.get(stage, 0.0) for query in queries)
+    record["rows"] = sum(query["rows"] for query in queries)
+    record["query_ids"] = [query["query_id"] for query in warehouse if query.get("query_id")]
+    get_recorder().add(record)
+
+
+def record_query(**stats):
+    record = getattr(_local, "record", None)
+    if record is not None:
+        record["queries"].append({"result_cache": False, "rows": 0, **stats})
+
+
+def record_local(store):
+    record = getattr(_local, "record", None)
+    if record is not None and store not in record["local_stores"]:
+        record["local_stores"].append(store)
+
+
+# --- Chart Rendering ---------------------------------------------------------------------------------------------------------------------------------
+def _points(values):
+    if values is None:
+        return 0
+    if isinstance(values, dict) and "bdata" in values:
+        # -- a typed array, as in figures rebuilt from their JSON (see utils.figure_cache)
+        return len(base64.b64decode(values["bdata"])) // np.dtype(values["dtype"]).itemsize
+    return len(values)
+
+
+def plotly_chart(container, fig, **kwargs):
+    # -- times serialising and sending the figure, the part of a chart that st.plotly_chart does on the script thread
+    record = _new_record("render", fig.layout.title.text or "chart")
+    started = time.perf_counter()
+    result = container.plotly_chart(fig, **kwargs)
+    record["total_s"] = time.perf_counter() - started
+    record["points"] = sum(_points(getattr(trace, "x", None)) for trace in fig.data)
+    get_recorder().add(record)
+    return result
+
+
+# --- Warehouse Statistics (looked up on demand; QUERY_HISTORY lags a few seconds behind) -----------------------------------------------------------
+@st.cache_data(ttl=600, show_spinner=False)
+def warehouse_stats(query_ids):
+    # -- imported here: utils.query_templates imports utils.snowflake_conn, which imports this module
+    from utils.query_templates import query_template, run_template
+
+    if not query_ids:
+        return pd.DataFrame(columns=["QUERY_ID", "BYTES_SCANNED", "QUEUED_MS", "COMPILATION_MS", "EXECUTION_MS"])
+    # -- the ids are bound as one comma-separated value, so any number of them shares one statement text
+    template = query_template("warehouse_query_stats", """
+    SELECT query_id,
+           bytes_scanned,
+           queued_provisioning_time + queued_repair_time + queued_overload_time AS queued_ms,
+           compilation_time AS compilation_ms,
+           execution_time AS execution_ms
+    FROM TABLE(information_schema.query_history(result_limit => 10000))
+    WHERE ARRAY_CONTAINS(query_id::variant, SPLIT(:query_ids, ','))
+    """)
+    return run_template(template, ttl=None, query_ids=",".join(query_ids))
+
+
+# --- Exports -----------------------------------------------------------------------------------------------------------------------------------------
+def to_jsonl(records):
+    return "".join(json.dumps(record, default=str) + "\n" for record in records)
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"')
+
+
+def to_prometheus(records, pool_stats=None):
+    lines = [
+        "# TYPE axelar_loader_calls_total counter",
+        "# TYPE axelar_loader_seconds_total counter",
+        "# TYPE axelar_loader_stage_seconds_total counter",
+        "# TYPE axelar_render_seconds_total counter",
+    ]
+    calls, seconds, stages, renders = {}, {}, {}, {}
+    for record in records:
+        if record["kind"] == "render":
+            key = (record["page"],)
+            renders[key] = renders.get(key, 0.0) + record["total_s"]
+            continue
+        key = (record["page"], record["name"], record["cache"])
+        calls[key] = calls.get(key, 0) + 1
+        seconds[key] = seconds.get(key, 0.0) + record["total_s"]
+        for stage in ["checkout_wait_s", "execute_s", "fetch_s", "frame_build_s"]:
+            stage_key = (record["page"], record["name"], stage[:-2])
+            stages[stage_key] = stages.get(stage_key, 0.0) + record[stage]
+    for (page, name, cache), value in calls.items():
+        labels = f'page="{_label(page)}",loader="{_label(name)}",cache="{cache}"'
+        lines.append(f"axelar_loader_calls_total{{{labels}}} {value}")
+        lines.append(f"axelar_loader_seconds_total{{{labels}}} {seconds[(page, name, cache)]:.6f}")
+    for (page, name, stage), value in stages.items():
+        lines.append(f'axelar_loader_stage_seconds_total{{page="{_label(page)}",loader="{_label(name)}",stage="{stage}"}} {value:.6f}')
+    for (page,), value in renders.items():
+        lines.append(f'axelar_render_seconds_total{{page="{_label(page)}"}} {value:.6f}')
+    for key, value in (pool_stats or {}).items():
+        lines.append(f"# TYPE axelar_pool_{key} gauge")
+        lines.append(f"axelar_pool_{key} {value}")
+    return "\n".join(lines) + "\n"
+
+
+# --- Sidebar Performance Panel -----------------------------------------------------------------------------------------------------------------------
+def performance_panel():
+    if not st.sidebar.toggle("Show performance panel", key="_perf_panel"):
+        return
+    from utils.snowflake_conn import get_local_backend, get_pool
+
+    run = st.session_state.get("_perf_run", {})
+    records = get_recorder().records(run_id=run.get("run_id"))
+    loaders = [record for record in records if record["kind"] == "loader"]
+    renders = [record for record in records if record["kind"] == "render"]
+    # -- the local backend has no connection pool and no QUERY_HISTORY
+    pool_stats = get_pool().stats() if get_local_backend() is None else {}
+
+    with st.sidebar.expander("⏱️Page Performance", expanded=True):
+        if "started" in run:
+            st.metric("Page run time", f"{time.perf_counter() - run['started']:.2f} s")
+        if loaders:
+            df = pd.DataFrame(loaders)
+            st.caption("Loader time by cache status (s)")
+            st.dataframe(df.groupby("cache")["total_s"].agg(["count", "sum"]).round(3), width="stretch")
+            st.dataframe(
+                df[["name", "cache", "total_s", "checkout_wait_s", "execute_s", "fetch_s", "frame_build_s", "rows"]]
+                .sort_values("total_s", ascending=False)
+                .round(3),
+                width="stretch",
+                hide_index=True,
+            )
+        if renders:
+            st.caption(f"Chart rendering: {sum(record['total_s'] for record in renders):.3f} s over {len(renders)} charts")
+
+        session_records = get_recorder().records(session=get_script_run_ctx().session_id, kind="loader")
+        query_ids = tuple(query_id for record in session_records for query_id in record.get("query_ids", []))[-50:]
+        if query_ids and st.checkbox("Look up bytes scanned and queue time", key="_perf_history"):
+            st.dataframe(warehouse_stats(query_ids), width="stretch", hide_index=True)
+
+        if pool_stats:
+            st.caption("Connection pool")
+            st.json(pool_stats, expanded=False)
+        all_records = get_recorder().records()
+        st.download_button("Export JSONL", to_jsonl(all_records), file_name="axelar_perf.jsonl")
+        st.download_button("Export Prometheus", to_prometheus(all_records, pool_stats), file_name="axelar_perf.prom")
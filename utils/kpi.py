@@ -0,0 +1,38 @@
+import pandas as pd
+
+from utils.query_templates import query_template, run_template
+from utils.result_cache import DEFAULT_RESULT_TTL
+
+
+# --- KPI Metric --------------------------------------------------------------------------------------------------------------------------------------
+# aggregate is an SQL aggregate with one "{}" slot for the expression, e.g. "COUNT(DISTINCT {})".
+class Metric:
+    def __init__(self, name, aggregate, expression, round_digits=None):
+        self.name = name
+        self.aggregate = aggregate
+        self.expression = expression
+        self.round_digits = round_digits
+
+    def to_sql(self):
+        sql = self.aggregate.format(self.expression)
+        if self.round_digits is not None:
+            sql = f"ROUND({sql}, {self.round_digits})"
+        return f'{sql} AS "{self.name}"'
+
+
+# --- KPI Engine --------------------------------------------------------------------------------------------------------------------------------------
+# Every metric of a header is computed from the same source in one scan. source may use :name bind parameters; their
+# values are passed to run_kpis.
+def compile_kpi_query(source, metrics):
+    select_list = ",\n           ".join(metric.to_sql() for metric in metrics)
+    return f"""
+    SELECT {select_list}
+    FROM {source}
+    """
+
+
+def run_kpis(source, metrics, name, ttl=DEFAULT_RESULT_TTL, **params):
+    template = query_template(name, compile_kpi_query(source, metrics))
+    # -- read column by column, so an integer count is not turned into a float by a row with a float median
+    df = run_template(template, ttl=ttl, **params)
+    return pd.Series({metric.name: df[metric.name].iloc[0] for metric in metrics}, dtype=object)
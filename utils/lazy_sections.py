@@ -0,0 +1,114 @@
+import plotly.graph_objects as go
+import streamlit as st
+
+from utils.figure_cache import cached_figure
+from utils.instrumentation import plotly_chart
+
+# --- Lazy Section Settings ---------------------------------------------------------------------------------------------------------------------------
+VIEWPORT_MARGIN = "300px"   # a section starts loading when it is this close to the viewport, so it is usually ready when it scrolls in
+WAITING_TEXT = "⏳ Loads when scrolled into view."
+
+# --- Viewport Sentinel -------------------------------------------------------------------------------------------------------------------------------
+# An empty element that fires its "visible" trigger once, the first time it comes within VIEWPORT_MARGIN of the viewport.
+# It is mounted in the app's DOM (not an iframe), so the observer's implicit root is the browser viewport. Registering the
+# same definition again is a no-op, so it is registered on every mount and follows a restarted runtime.
+_SENTINEL_JS = """
+export default function({ parentElement, setTriggerValue, data }) {
+    const observer = new IntersectionObserver((entries) => {
+        if (entries.some((entry) => entry.isIntersecting)) {
+            observer.disconnect();
+            setTriggerValue("visible", true);
+        }
+    }, { rootMargin: data.margin });
+    observer.observe(parentElement);
+    return () => observer.disconnect();
+}
+"""
+
+
+def _sentinel(**kwargs):
+    return st.components.v2.component("lazy_section_sentinel", js=_SENTINEL_JS, isolate_styles=False)(**kwargs)
+
+
+def _draw(elements, key=None):
+    # -- a builder returns one element or a list of them, drawn side by side: figures, tables (DataFrame / Styler) or an info text
+    elements = elements if isinstance(elements, list) else [elements]
+    columns = st.columns(len(elements)) if len(elements) > 1 else [st.container()]
+    for i, (column, element) in enumerate(zip(columns, elements)):
+        # -- a stale copy is drawn under its own key, so it never collides with the fresh element that replaces it in the same run
+        kwargs = {"key": f"{key}_{i}"} if key else {}
+        if isinstance(element, go.Figure):
+            plotly_chart(column, element, width="stretch", **kwargs)
+        elif isinstance(element, str):
+            column.info(element)
+        else:
+            column.dataframe(element, width="stretch", **kwargs)
+
+
+# --- Lazy Sections -----------------------------------------------------------------------------------------------------------------------------------
+# A page declares its below-the-fold sections up front with their loader, the loader's arguments and a figure builder.
+# A section's loader only runs once the section is active: it has come into view for these arguments (or, for a section
+# declared with an expander label, the expander is open). Active sections are submitted to the page's QueryScheduler when
+# they are declared, so they still run concurrently. Until then a section shows the figures it last built in this session,
+# or a short placeholder; changing the arguments (a new date range) makes every section wait for the viewport again.
+# Builders run through the shared figure cache (see utils.figure_cache), so they must only depend on their argument.
+# Set `lazy_sections = false` under [pages] in secrets.toml to load every section eagerly.
+class LazySection:
+    def __init__(self, key, loader, args, build, label=None):
+        self.key = key
+        self.loader = loader
+        self.args = args
+        self.build = build
+        self.label = label
+        self.token = repr(args)
+
+
+class LazySections:
+    def __init__(self, queries):
+        self._queries = queries
+        self._sections = {}
+        self._lazy = st.secrets.get("pages", {}).get("lazy_sections", True)
+        self._seen = st.session_state.setdefault("_lazy_seen", {})
+        self._figures = st.session_state.setdefault("_lazy_figures", {})
+
+    def add(self, key, loader, args, build, label=None):
+        section = self._sections[key] = LazySection(key, loader, args, build, label)
+        if self.active(section):
+            self._queries.submit(key, loader, *args)
+
+    def active(self, section):
+        if not self._lazy:
+            return True
+        if section.label is not None:
+            return bool(st.session_state.get(f"_lazy_open_{section.key}"))
+        return self._seen.get(section.key) == section.token
+
+    def _mark_seen(self, section):
+        self._seen[section.key] = section.token
+
+    def render(self, key):
+        section = self._sections[key]
+        if section.label is None:
+            self._render(section)
+            return
+        with st.expander(section.label, expanded=not self._lazy, key=f"_lazy_open_{key}", on_change="rerun"):
+            self._render(section)
+
+    def _render(self, section):
+        stale = self._figures.get(section.key)
+        if not self.active(section):
+            if section.label is None:
+                _sentinel(key=f"_lazy_sentinel_{section.key}", data={"margin": VIEWPORT_MARGIN},
+                          on_visible_change=lambda: self._mark_seen(section))
+            if stale is not None:
+                _draw(stale, key=f"_lazy_stale_{section.key}")
+            else:
+                st.caption(WAITING_TEXT)
+            return
+        slot = st.empty()
+        if stale is not None and not self._queries.done(section.key):
+            with slot.container():
+                _draw(stale, key=f"_lazy_stale_{section.key}")
+        figures = self._figures[section.key] = cached_figure(section.build, self._queries.result(section.key))
+        with slot.container():
+            _draw(figures)
@@ -0,0 +1,123 @@
+import abc
+import inspect
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils.instrumentation import record_local
+
+# --- Local Storage Settings --------------------------------------------------------------------------------------------------------------------------
+CACHE_DIR = os.environ.get("AXELAR_CACHE_DIR", ".cache")
+HISTORY_START = "2020-01-01"  # earlier than the first Axelar block, so a full build covers everything
+
+
+def cache_path(*parts):
+    path = os.path.join(CACHE_DIR, *parts)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
+
+
+def write_parquet_atomic(df, path):
+    tmp_path = f"{path}.tmp"
+    df.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+
+# --- Date Bucketing (same semantics as Snowflake date_trunc) ----------------------------------------------------------------------------------------
+def truncate_dates(dates, timeframe):
+    dates = pd.to_datetime(pd.Series(dates))
+    if timeframe == "week":
+        # -- Snowflake weeks start on Monday
+        return dates.dt.to_period("W-SUN").dt.start_time
+    elif timeframe == "month":
+        return dates.dt.to_period("M").dt.start_time
+    elif timeframe == "year":
+        return dates.dt.to_period("Y").dt.start_time
+    else:
+        return dates.dt.normalize()
+
+
+# --- Change Detection --------------------------------------------------------------------------------------------------------------------------------
+def _fingerprint(frame):
+    # -- order-insensitive, since a re-pulled day may come back in any row order
+    if frame is None:
+        return None
+    return np.sort(pd.util.hash_pandas_object(frame, index=False).to_numpy())
+
+
+# --- Incremental Store -------------------------------------------------------------------------------------------------------------------------------
+# A local table keyed by day that is refreshed from the warehouse by pulling only the days at or after its watermark.
+# The watermark day itself is always re-pulled because it was most likely still in progress at the previous refresh.
+# Pages register the st.cache_data loaders computed from a store with invalidate_on_update(), so a refresh that changes the
+# table (new days, or more of the still-open one) drops their cached results instead of leaving them out of date until
+# their ttl expires. A refresh that pulls the watermark day back unchanged keeps them.
+class IncrementalStore(abc.ABC):
+    name = None
+    date_column = "day"
+    refresh_interval = 3600  # seconds
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._path = cache_path(f"{self.name}.parquet")
+        self._frame = pd.read_parquet(self._path) if os.path.exists(self._path) else None
+        self._refreshed_at = 0.0
+        self._dependents = {}
+        if self._frame is not None:
+            self._on_update()
+
+    @property
+    def watermark(self):
+        if self._frame is None or self._frame.empty:
+            return None
+        return self._frame[self.date_column].max()
+
+    @abc.abstractmethod
+    def fetch(self, since):
+        # -- the rows of every day at or after `since`
+        ...
+
+    def merge(self, old, new, since):
+        if old is None:
+            return new
+        old = old[old[self.date_column] < pd.Timestamp(since)]
+        return pd.concat([old, new], ignore_index=True)
+
+    def _on_update(self):
+        pass
+
+    def refresh(self, force=False):
+        with self._lock:
+            # -- another session may have finished the same refresh while we waited for the lock
+            if not force and not self.is_stale():
+                return
+            watermark = self.watermark
+            since = watermark.date() if watermark is not None else pd.Timestamp(HISTORY_START).date()
+            before = _fingerprint(self._frame)
+            new = self.fetch(since)
+            new[self.date_column] = pd.to_datetime(new[self.date_column])
+            self._frame = self.merge(self._frame, new, since)
+            write_parquet_atomic(self._frame, self._path)
+            self._refreshed_at = time.time()
+            self._on_update()
+            if before is None or not np.array_equal(before, _fingerprint(self._frame)):
+                for loader in list(self._dependents.values()):
+                    loader.clear()
+
+    def invalidate_on_update(self, *loaders):
+        # -- loaders are @instrumented @st.cache_data functions; a page re-registers them on every run, so they are keyed by
+        # -- the source function rather than by the wrapper objects of one run
+        for loader in loaders:
+            source = inspect.unwrap(loader)
+            self._dependents[(os.path.abspath(source.__code__.co_filename), source.__qualname__)] = loader.__wrapped__
+
+    def is_stale(self):
+        return self._frame is None or time.time() - self._refreshed_at > self.refresh_interval
+
+    def frame(self):
+        record_local(self.name)
+        if self.is_stale():
+            self.refresh()
+        return self._frame
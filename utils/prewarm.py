@@ -0,0 +1,137 @@
+import datetime
+import glob
+import os
+import runpy
+import threading
+import time
+import traceback
+
+import streamlit as st
+
+# --- Default View (every page opens with it; the date widgets take their defaults from here) --------------------------------------------------------
+DEFAULT_START_DATE = datetime.date(2023, 1, 1)
+DEFAULT_END_DATE = datetime.date(2025, 7, 31)
+TIMEFRAMES = ["month", "week", "day"]
+
+# --- Pre-Warmer Settings -----------------------------------------------------------------------------------------------------------------------------
+# [prewarm] in secrets.toml: enabled = true, interval = 480 (seconds). A cycle recomputes the default-view entries that would
+# expire before the next cycle, so keep the interval at about 0.8 x the shortest loader ttl (600 s): such an entry is
+# replaced before it expires and a visitor never finds it expired.
+PREWARM_INTERVAL = 480
+PAGES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "pages")
+
+# --- Warm-Up Registry (one per server process) -------------------------------------------------------------------------------------------------------
+# Each page registers a function (start_date, end_date, timeframe) -> [(loader, *args), ...] listing the loader calls of
+# that view exactly as the page makes them: st.cache_data keys on the arguments as passed, so the same positional call
+# must be repeated for the pre-warmed entry to be the one a visitor hits. A page re-registers on every run.
+_warmups = {}
+_warmups_lock = threading.Lock()
+
+
+def register_warmup(page, calls):
+    with _warmups_lock:
+        _warmups[page] = calls
+    start_prewarmer()
+
+
+def _default_view_calls():
+    with _warmups_lock:
+        warmups = dict(_warmups)
+    calls = {}
+    for page, view in warmups.items():
+        for timeframe in TIMEFRAMES:
+            for fn, *args in view(DEFAULT_START_DATE, DEFAULT_END_DATE, timeframe):
+                # -- loaders that ignore the time frame are listed once per time frame, but only need one call
+                calls.setdefault((page, fn.__qualname__, repr(args)), (fn, args))
+    return calls
+
+
+# --- Pre-Warmer --------------------------------------------------------------------------------------------------------------------------------------
+# A daemon thread that runs every registered default-view loader call for month, week and day: at startup and then every
+# `interval` seconds. The calls go through the loaders' own st.cache_data wrappers and the shared local stores, so a
+# fresh result lands in the same process-wide caches a visitor's run reads. An st.cache_data entry that would expire before
+# the next cycle is cleared right before its call, so the call recomputes it instead of hitting the entry that is about to
+# expire; only a visitor arriving during that recompute computes it too. Every other call is a cache hit unless its entry
+# is missing, e.g. because a store refresh pulled new rows and dropped it (see IncrementalStore.invalidate_on_update).
+# Loaders without a ttl and loaders with their own refresh (utils.swr) are never cleared. Streamlit has no startup hook,
+# so the thread is started by the first script run of the process; it first runs every page script once in bare mode
+# (widgets return their defaults, elements are dropped) so that pages nobody has opened yet register their warm-ups too.
+class PreWarmer:
+    def __init__(self, interval=PREWARM_INTERVAL, pages_dir=PAGES_DIR):
+        self._interval = interval
+        self._pages_dir = pages_dir
+        self._thread = None
+        self._lock = threading.Lock()
+        self._recomputed_at = {}   # call -> when the pre-warmer last recomputed its entry
+        self._stats = {"cycles": 0, "calls": 0, "errors": 0, "last_cycle_s": None, "last_cycle_at": None, "last_error": None}
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._loop, name="axelar-prewarm", daemon=True)
+                self._thread.start()
+
+    def _loop(self):
+        self._discover_pages()
+        while True:
+            self.warm()
+            time.sleep(self._interval)
+
+    def _discover_pages(self):
+        for path in sorted(glob.glob(os.path.join(self._pages_dir, "*.py"))):
+            try:
+                runpy.run_path(path, run_name="__main__")
+            except Exception:
+                self._error(path)
+
+    def warm(self):
+        started = time.perf_counter()
+        calls = _default_view_calls()
+        for call, (fn, args) in calls.items():
+            try:
+                # -- loaders are @instrumented @st.cache_data functions; clear(*args) drops this call's entry only
+                cached = getattr(fn, "__wrapped__", None)
+                expiring = self._expiring(call, cached)
+                if expiring:
+                    cached.clear(*args)
+                fn(*args)
+                if expiring:
+                    self._recomputed_at[call] = time.time()
+            except Exception:
+                self._error(fn.__qualname__)
+        with self._lock:
+            self._stats["cycles"] += 1
+            self._stats["calls"] = len(calls)
+            self._stats["last_cycle_s"] = time.perf_counter() - started
+            self._stats["last_cycle_at"] = time.time()
+
+    def _expiring(self, call, cached):
+        ttl = getattr(getattr(cached, "_info", None), "ttl", None)
+        if ttl is None or not hasattr(cached, "clear"):
+            return False
+        # -- an entry the pre-warmer has not recomputed yet may be as old as a full ttl, so it counts as expiring
+        return time.time() - self._recomputed_at.get(call, 0.0) + self._interval >= ttl
+
+    def _error(self, where):
+        # -- a failing loader must not stop the others; the next cycle retries it
+        with self._lock:
+            self._stats["errors"] += 1
+            self._stats["last_error"] = f"{where}: {traceback.format_exc(limit=1).strip().splitlines()[-1]}"
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats)
+
+
+@st.cache_resource(show_spinner=False)
+def get_prewarmer():
+    settings = st.secrets.get("prewarm", {})
+    if not settings.get("enabled", True):
+        return None
+    return PreWarmer(interval=float(settings.get("interval", PREWARM_INTERVAL)))
+
+
+def start_prewarmer():
+    prewarmer = get_prewarmer()
+    if prewarmer is not None:
+        prewarmer.start()
@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+
+# --- Log-Bucket Quantile Sketch ----------------------------------------------------------------------------------------------------------------------
+# A value v > 0 falls in bucket floor(log_gamma(v)), so bucket b holds gamma^b <= v < gamma^(b+1); bucket -1 holds zeros.
+# Bucket counts are produced by a plain GROUP BY in the warehouse and merge by summation over any set of days or buckets,
+# and every quantile read back is within a relative error of (gamma - 1) / (gamma + 1), ~0.5% for gamma = 1.01.
+SKETCH_GAMMA = 1.01
+
+
+def bucket_sql(column):
+    return f"""CASE WHEN {column} > 0 THEN FLOOR(LN({column}) / LN({SKETCH_GAMMA}))
+                    WHEN {column} IS NOT NULL THEN -1
+               END"""
+
+
+def bucket_value(bucket):
+    bucket = np.asarray(bucket, dtype=np.float64)
+    return np.where(bucket < 0, 0.0, SKETCH_GAMMA ** bucket * (1 + SKETCH_GAMMA) / 2)
+
+
+def quantile_label(q):
+    return f"p{q * 100:g}"
+
+
+# --- Reading Quantiles -------------------------------------------------------------------------------------------------------------------------------
+# rows hold (by..., bucket_column, count_column); the result has one "p50"/"p90"/... column per requested quantile,
+# or is a Series indexed by those labels when by is None.
+def sketch_quantiles(rows, bucket_column, count_column, qs, by=None):
+    keys = (by or []) + [bucket_column]
+    hist = rows[rows[count_column] > 0].dropna(subset=[bucket_column])
+    hist = hist.groupby(keys, as_index=False)[count_column].sum().sort_values(keys)
+    if by is None:
+        cumulative = hist[count_column].cumsum()
+        total = cumulative.iloc[-1] if len(cumulative) else 0
+    else:
+        cumulative = hist.groupby(by)[count_column].cumsum()
+        total = hist.groupby(by)[count_column].transform("sum")
+
+    out = {}
+    for q in qs:
+        # -- first bucket whose cumulative count reaches q of the total
+        reached = hist[cumulative >= q * total]
+        if by is None:
+            out[quantile_label(q)] = float(bucket_value(reached[bucket_column].iloc[0])) if len(reached) else np.nan
+        else:
+            first = reached.groupby(by)[bucket_column].first()
+            out[quantile_label(q)] = pd.Series(bucket_value(first), index=first.index)
+    if by is None:
+        return pd.Series(out, dtype=float)
+    return pd.DataFrame(out).rename_axis(by).reset_index()
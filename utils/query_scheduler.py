@@ -0,0 +1,44 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+from utils.snowflake_conn import POOL_SIZE
+
+
+# --- Shared Worker Pool (sized like the Snowflake connection pool, so workers never queue on a connection) --------------------------------------------
+@st.cache_resource
+def get_executor():
+    workers = int(st.secrets.get("snowflake", {}).get("pool_size", POOL_SIZE))
+    return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="axelar-loader")
+
+
+# --- Query Scheduler ---------------------------------------------------------------------------------------------------------------------------------
+# Submits a page's independent loaders together so the page waits for the slowest query instead of the sum of all of them.
+# Rows are still rendered top to bottom: result() only blocks until that row's own loader is done.
+# Loaders submitted here must be declared with @st.cache_data(show_spinner=False), otherwise the cache spinner would be written
+# into the page from a worker thread; result() shows the spinner on the script thread instead.
+class QueryScheduler:
+    def __init__(self):
+        self._ctx = get_script_run_ctx()
+        self._futures = {}
+        self._names = {}
+
+    def _run(self, fn, args, kwargs):
+        add_script_run_ctx(threading.current_thread(), self._ctx)
+        return fn(*args, **kwargs)
+
+    def submit(self, key, fn, *args, **kwargs):
+        self._futures[key] = get_executor().submit(self._run, fn, args, kwargs)
+        self._names[key] = getattr(fn, "__name__", key)
+
+    def done(self, key):
+        return self._futures[key].done()
+
+    def result(self, key):
+        future = self._futures[key]
+        if future.done():
+            return future.result()
+        with st.spinner(f"Running `{self._names[key]}(...)`."):
+            return future.result()
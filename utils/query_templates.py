@@ -0,0 +1,94 @@
+import re
+import threading
+
+from utils.result_cache import _QUOTED, DEFAULT_RESULT_TTL, normalize_sql
+from utils.snowflake_conn import run_query
+
+# --- Structural Fragments ----------------------------------------------------------------------------------------------------------------------------
+# Parts of a statement that cannot be bind parameters (date parts, identifiers) are {slot}s chosen from a fixed set of choices,
+# so every choice compiles to its own canonical text and user input never reaches the SQL.
+DATE_BUCKETS = {
+    "day": "block_timestamp::date",
+    "week": "date_trunc('week', block_timestamp)",
+    "month": "date_trunc('month', block_timestamp)",
+}
+
+_BIND = re.compile(r"(?<![:\w]):([A-Za-z_]\w*)")
+_SLOT = re.compile(r"\{(\w+)\}")
+
+
+# --- Query Template ----------------------------------------------------------------------------------------------------------------------------------
+# sql names its bind parameters as :name (outside quoted literals; ::casts are left alone). Every variant is compiled once
+# into canonical qmark text plus the order of its parameters, so equal queries from any session send the same statement
+# text and only their values differ: Snowflake skips the compile for a statement it has seen, and its result cache
+# (like ours, keyed on text + values) is shared across sessions.
+class CompiledQuery:
+    def __init__(self, text, names):
+        self.text = text
+        self.names = names
+
+    def params(self, values):
+        missing = [name for name in self.names if name not in values]
+        if missing:
+            raise KeyError(f"Missing bind parameters: {', '.join(sorted(set(missing)))}")
+        return [values[name] for name in self.names]
+
+
+class QueryTemplate:
+    def __init__(self, name, sql, **fragments):
+        self.name = name
+        self.sql = sql
+        self.fragments = fragments
+        self._compiled = {}
+        self._lock = threading.Lock()
+        unknown = set(_SLOT.findall(sql)) - set(fragments)
+        if unknown:
+            raise ValueError(f"Template {name} has no choices for {', '.join(sorted(unknown))}")
+
+    def compile(self, **choices):
+        key = tuple(sorted(choices.items()))
+        compiled = self._compiled.get(key)
+        if compiled is None:
+            with self._lock:
+                compiled = self._compiled.get(key) or self._compile(choices)
+                self._compiled[key] = compiled
+        return compiled
+
+    def _compile(self, choices):
+        def fragment(match):
+            slot = match.group(1)
+            if choices.get(slot) not in self.fragments[slot]:
+                raise ValueError(f"{slot}={choices.get(slot)!r} is not one of {list(self.fragments[slot])} in template {self.name}")
+            return self.fragments[slot][choices[slot]]
+
+        parts = _QUOTED.split(_SLOT.sub(fragment, self.sql))
+        names = []
+        for i in range(0, len(parts), 2):
+            names += _BIND.findall(parts[i])
+            parts[i] = _BIND.sub("?", parts[i])
+        return CompiledQuery(normalize_sql("".join(parts)), names)
+
+    def bind(self, **values):
+        choices = {slot: values.pop(slot) for slot in self.fragments if slot in values}
+        compiled = self.compile(**choices)
+        return compiled.text, compiled.params(values)
+
+
+# --- Template Registry (one per server process) ------------------------------------------------------------------------------------------------------
+# Pages re-run their module code on every interaction, so templates are looked up by name and the compiled variants survive;
+# a template whose text changed (a page edited while the server runs) replaces the registered one.
+_registry = {}
+_registry_lock = threading.Lock()
+
+
+def query_template(name, sql, **fragments):
+    with _registry_lock:
+        template = _registry.get(name)
+        if template is None or template.sql != sql or template.fragments != fragments:
+            template = _registry[name] = QueryTemplate(name, sql, **fragments)
+    return template
+
+
+def run_template(template, ttl=DEFAULT_RESULT_TTL, **values):
+    query, params = template.bind(**values)
+    return run_query(query, ttl=ttl, params=params)
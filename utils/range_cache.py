@@ -0,0 +1,115 @@
+import glob
+import json
+import os
+import threading
+import time
+import uuid
+
+import pandas as pd
+
+from utils.instrumentation import record_local
+from utils.local_store import CACHE_DIR, write_parquet_atomic
+
+# --- Range Cache Settings ----------------------------------------------------------------------------------------------------------------------------
+OPEN_DAYS = 2            # today and yesterday may still receive rows, so they are never persisted as complete
+OPEN_DAY_TTL = 600       # seconds an in-memory copy of an open day is reused before it is fetched again
+MAX_CHUNK_FILES = 32     # compact the on-disk chunks into one file once there are more than this
+
+
+def _day_runs(days):
+    # -- group a sorted list of days into contiguous (first, last) runs
+    runs = []
+    for day in days:
+        if runs and day - runs[-1][1] == pd.Timedelta(days=1):
+            runs[-1][1] = day
+        else:
+            runs.append([day, day])
+    return [tuple(run) for run in runs]
+
+
+# --- Daily Range Cache -------------------------------------------------------------------------------------------------------------------------------
+# Caches a per-day series by day partition: a request for [start, end] only fetches the days that were never cached,
+# so moving end_date forward by one day costs a one-day query instead of a rescan of the whole range.
+# fetch(first_day, last_day) must return every row for those days with a `date_column` holding the day.
+class DailyRangeCache:
+    def __init__(self, name, fetch, date_column="day"):
+        self._name = name
+        self._fetch = fetch
+        self._date_column = date_column
+        self._directory = os.path.join(CACHE_DIR, "ranges", name)
+        self._covered_path = os.path.join(self._directory, "covered.json")
+        self._lock = threading.Lock()
+        self._open_fetched_at = {}
+        os.makedirs(self._directory, exist_ok=True)
+        self._load()
+
+    def _load(self):
+        chunk_paths = sorted(glob.glob(os.path.join(self._directory, "*.parquet")))
+        frames = [pd.read_parquet(path) for path in chunk_paths]
+        self._frame = pd.concat(frames, ignore_index=True) if frames else None
+        self._covered = set()
+        if os.path.exists(self._covered_path):
+            with open(self._covered_path) as f:
+                for first, last in json.load(f):
+                    self._covered.update(pd.date_range(first, last, freq="D"))
+        if len(chunk_paths) > MAX_CHUNK_FILES:
+            self._compact(chunk_paths)
+
+    def _compact(self, chunk_paths):
+        closed = self._frame[self._frame[self._date_column].isin(self._covered)]
+        write_parquet_atomic(closed, os.path.join(self._directory, f"compact-{uuid.uuid4().hex}.parquet"))
+        for path in chunk_paths:
+            os.remove(path)
+
+    def _save_covered(self):
+        runs = [[first.strftime("%Y-%m-%d"), last.strftime("%Y-%m-%d")] for first, last in _day_runs(sorted(self._covered))]
+        tmp_path = f"{self._covered_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(runs, f)
+        os.replace(tmp_path, self._covered_path)
+
+    def _missing_days(self, days):
+        now = time.time()
+        first_open_day = pd.Timestamp.today().normalize() - pd.Timedelta(days=OPEN_DAYS - 1)
+        missing = []
+        for day in days:
+            if day in self._covered:
+                continue
+            if day >= first_open_day and now - self._open_fetched_at.get(day, 0) < OPEN_DAY_TTL:
+                continue
+            missing.append(day)
+        return missing, first_open_day
+
+    def _store(self, new, first, last, first_open_day):
+        new = new.copy()
+        new[self._date_column] = pd.to_datetime(new[self._date_column])
+        if self._frame is not None:
+            keep = (self._frame[self._date_column] < first) | (self._frame[self._date_column] > last)
+            self._frame = pd.concat([self._frame[keep], new], ignore_index=True)
+        else:
+            self._frame = new
+
+        closed_days = [day for day in pd.date_range(first, last, freq="D") if day < first_open_day]
+        if closed_days:
+            closed = new[new[self._date_column] < first_open_day]
+            if not closed.empty:
+                write_parquet_atomic(closed, os.path.join(self._directory, f"{first:%Y%m%d}-{uuid.uuid4().hex}.parquet"))
+            self._covered.update(closed_days)
+            self._save_covered()
+        now = time.time()
+        for day in pd.date_range(max(first, first_open_day), last, freq="D"):
+            self._open_fetched_at[day] = now
+
+    def get(self, start_date, end_date):
+        record_local(self._name)
+        days = pd.date_range(pd.Timestamp(start_date), pd.Timestamp(end_date), freq="D")
+        with self._lock:
+            missing, first_open_day = self._missing_days(days)
+            for first, last in _day_runs(missing):
+                self._store(self._fetch(first.date(), last.date()), first, last, first_open_day)
+            if self._frame is None:
+                return pd.DataFrame(columns=[self._date_column])
+            if len(days) == 0:
+                return self._frame.iloc[0:0]
+            in_range = (self._frame[self._date_column] >= days[0]) & (self._frame[self._date_column] <= days[-1])
+            return self._frame[in_range].sort_values(self._date_column).reset_index(drop=True)
@@ -0,0 +1,118 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+
+import pyarrow as pa
+import streamlit as st
+
+from utils.local_store import CACHE_DIR
+
+# --- Result Cache Settings ---------------------------------------------------------------------------------------------------------------------------
+DEFAULT_RESULT_TTL = 6 * 3600  # seconds
+MAX_RESULT_CACHE_BYTES = int(os.environ.get("AXELAR_RESULT_CACHE_MB", "512")) * 1024 * 1024
+
+_QUOTED = re.compile(r"""('(?:[^']|'')*'|"(?:[^"]|"")*")""")
+
+
+# --- Cache Key ---------------------------------------------------------------------------------------------------------------------------------------
+def normalize_sql(query):
+    # -- collapse whitespace outside of quoted literals/identifiers so indentation changes don't miss the cache
+    parts = _QUOTED.split(query)
+    for i in range(0, len(parts), 2):
+        parts[i] = re.sub(r"\s+", " ", parts[i])
+    return "".join(parts).strip().rstrip(";").strip()
+
+
+def cache_key(query, params=None):
+    payload = json.dumps([normalize_sql(query), params or {}], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# --- Persistent Result Cache (Arrow IPC files, memory-mapped on read) --------------------------------------------------------------------------------
+# The file's mtime is the time it was written (TTL), its atime is bumped on every hit (LRU eviction).
+# A hit maps the file instead of reading it into Arrow buffers first, and the columns are copied straight from the mapped
+# pages into the frame, each Arrow column being released right after (self_destruct). The frame owns its memory, so a hit
+# can be modified in place exactly like a freshly fetched result.
+class ResultCache:
+    def __init__(self, directory, max_bytes=MAX_RESULT_CACHE_BYTES, default_ttl=DEFAULT_RESULT_TTL):
+        self._directory = directory
+        self._max_bytes = max_bytes
+        self._default_ttl = default_ttl
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self._directory, f"{key}.arrow")
+
+    def get(self, query, params=None, ttl=None):
+        ttl = self._default_ttl if ttl is None else ttl
+        path = self._path(cache_key(query, params))
+        try:
+            written_at = os.stat(path).st_mtime
+        except FileNotFoundError:
+            return None
+
+        now = time.time()
+        if now - written_at > ttl:
+            self._remove(path)
+            return None
+
+        try:
+            with pa.memory_map(path, "r") as source:
+                table = pa.ipc.open_file(source).read_all()
+            df = table.to_pandas(self_destruct=True)
+            del table
+        except (OSError, pa.ArrowInvalid):
+            # -- a half-written or corrupted entry is just a miss
+            self._remove(path)
+            return None
+        os.utime(path, (now, written_at))
+        return df
+
+    def put(self, query, df, params=None):
+        path = self._path(cache_key(query, params))
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        with pa.OSFile(tmp_path, "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, path)
+        self.evict()
+
+    def evict(self):
+        with self._lock:
+            entries = []
+            for name in os.listdir(self._directory):
+                if not name.endswith(".arrow"):
+                    continue
+                path = os.path.join(self._directory, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_atime, stat.st_size, path))
+
+            total = sum(size for _, size, _ in entries)
+            if total <= self._max_bytes:
+                return
+            # -- drop least recently used entries until we are back under 90% of the budget
+            for _, size, path in sorted(entries):
+                self._remove(path)
+                total -= size
+                if total <= self._max_bytes * 0.9:
+                    break
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+@st.cache_resource
+def get_result_cache():
+    return ResultCache(os.path.join(CACHE_DIR, "results"))
@@ -0,0 +1,139 @@
+import functools
+import json
+import os
+import threading
+import time
+import traceback
+
+import pandas as pd
+import streamlit as st
+
+from utils.local_store import cache_path, write_parquet_atomic
+
+# --- Stale-While-Revalidate Settings -----------------------------------------------------------------------------------------------------------------
+SWR_MAX_AGE = 600        # seconds a result is fresh; an older one is still served while a background refresh replaces it
+SWR_RETRY_AFTER = 60     # seconds before a failed background refresh is tried again (the last good result is served meanwhile)
+
+
+# --- Last-Known-Good Results (one per server process, shared by every session) -----------------------------------------------------------------------
+# Every successful result is kept in memory and on disk (DataFrames as Parquet, anything else as JSON; the file's mtime is
+# when it was fetched), so a restarted server starts from the last good copy too. Only a key that has never succeeded
+# makes its caller wait for the loader, and only then does a failure reach the page.
+class RevalidatingCache:
+    def __init__(self, name="swr"):
+        self._name = name
+        self._lock = threading.Lock()
+        self._entries = {}       # key -> (result, fetched_at)
+        self._refreshing = set()
+        self._load_locks = {}    # key -> lock held by the one caller running a first load
+        self._retry_at = {}
+        self._stats = {"fresh": 0, "stale": 0, "loads": 0, "refreshes": 0, "errors": 0, "last_error": None}
+
+    def _path(self, key, result=None):
+        if result is None:
+            # -- reading: whichever format the key was last written in
+            for extension in ("parquet", "json"):
+                path = cache_path(self._name, f"{key}.{extension}")
+                if os.path.exists(path):
+                    return path
+            return None
+        return cache_path(self._name, f"{key}.{'parquet' if isinstance(result, pd.DataFrame) else 'json'}")
+
+    def _entry(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None:
+            return entry
+        path = self._path(key)
+        if path is None:
+            return None
+        try:
+            if path.endswith(".parquet"):
+                result = pd.read_parquet(path)
+            else:
+                with open(path) as f:
+                    result = json.load(f)
+            entry = (result, os.path.getmtime(path))
+        except (OSError, ValueError):
+            return None
+        with self._lock:
+            return self._entries.setdefault(key, entry)
+
+    def _store(self, key, result):
+        path = self._path(key, result)
+        if isinstance(result, pd.DataFrame):
+            write_parquet_atomic(result, path)
+        else:
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(result, f)
+            os.replace(tmp_path, path)
+        with self._lock:
+            self._entries[key] = (result, time.time())
+
+    def get(self, key, load, max_age=SWR_MAX_AGE):
+        entry = self._entry(key) or self._first_load(key, load)
+        result, fetched_at = entry
+        stale = time.time() - fetched_at > max_age
+        with self._lock:
+            self._stats["stale" if stale else "fresh"] += 1
+        if stale:
+            self._revalidate(key, load)
+        return result
+
+    def _first_load(self, key, load):
+        # -- on a cold server every session opening the page arrives here: one runs the load, the others wait and get its
+        # -- result; if it fails, the next waiter tries again
+        with self._lock:
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+        with load_lock:
+            entry = self._entry(key)
+            if entry is None:
+                self._store(key, load())
+                with self._lock:
+                    self._stats["loads"] += 1
+                entry = self._entry(key)
+        return entry
+
+    def _revalidate(self, key, load):
+        with self._lock:
+            if key in self._refreshing or time.time() < self._retry_at.get(key, 0.0):
+                return
+            self._refreshing.add(key)
+        threading.Thread(target=self._refresh, args=(key, load), name=f"axelar-swr-{key}", daemon=True).start()
+
+    def _refresh(self, key, load):
+        try:
+            self._store(key, load())
+            with self._lock:
+                self._stats["refreshes"] += 1
+                self._retry_at.pop(key, None)
+        except Exception:
+            # -- an upstream outage: keep serving the last good result and try again later
+            with self._lock:
+                self._stats["errors"] += 1
+                self._stats["last_error"] = f"{key}: {traceback.format_exc(limit=1).strip().splitlines()[-1]}"
+                self._retry_at[key] = time.time() + SWR_RETRY_AFTER
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats)
+
+
+@st.cache_resource(show_spinner=False)
+def get_revalidating_cache():
+    return RevalidatingCache()
+
+
+def stale_while_revalidate(max_age=SWR_MAX_AGE):
+    # -- for loaders without arguments that call external services; used in place of st.cache_data(ttl=max_age). Unlike
+    # -- st.cache_data, every session gets the same object back, so callers must not modify the result in place
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper():
+            return get_revalidating_cache().get(fn.__name__, fn, max_age)
+        return wrapper
+    return decorator
@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+# --- TVL Payload Schema (api.axelarscan.io/api/getTVL) -----------------------------------------------------------------------------------------------
+# data[] holds one object per asset, each with a `tvl` mapping of chain -> details; the page wants one row per (asset, chain).
+ASSET_FIELDS = {"asset": "Asset ID", "assetType": "Asset Type", "price": "Price (USD)", "value": "Total Asset Value (USD)",
+                "is_abnormal_supply": "Is Abnormal?"}
+CHAIN_FIELDS = {"gateway_address": "Gateway Address", "supply": "Supply", "total": "Total TVL"}
+CONTRACT_FIELDS = {"symbol": "Token Symbol", "name": "Token Name", "contract_address": "Contract Address"}
+# -- the expected types of a chain's details; Arrow converts a list of such dicts in one C++ pass (extra keys are ignored)
+CHAIN_TYPE = pa.struct([
+    ("gateway_address", pa.string()),
+    ("supply", pa.float64()),
+    ("total", pa.float64()),
+    ("contract_data", pa.struct([(field, pa.string()) for field in CONTRACT_FIELDS])),
+])
+NUMERIC_COLUMNS = ["Supply", "Total TVL", "Price (USD)", "TVL (USD)", "Total Asset Value (USD)"]
+TVL_COLUMNS = ["Asset ID", "Asset Type", "Chain", "Token Symbol", "Token Name", "Contract Address", "Gateway Address", "Supply",
+               "Total TVL", "Price (USD)", "TVL (USD)", "Total Asset Value (USD)", "Is Abnormal?"]
+
+
+# --- Columnar Normalization --------------------------------------------------------------------------------------------------------------------------
+# Every column is collected first and the frame is built once: asset fields are read once per asset and repeated over its
+# chains with np.repeat; the (asset, chain) details, which are most of the payload, go through Arrow with CHAIN_TYPE.
+# Numeric conversion and TVL (USD) then run once over whole columns.
+def _chain_columns(details):
+    try:
+        chains = pa.array(details, type=CHAIN_TYPE)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # -- a field of an unexpected type (e.g. a number sent as a string): read the fields one by one instead
+        contracts = [chain_details.get("contract_data") or {} for chain_details in details]
+        columns = {column: [chain_details.get(field) for chain_details in details] for field, column in CHAIN_FIELDS.items()}
+        columns.update({column: [contract.get(field) for contract in contracts] for field, column in CONTRACT_FIELDS.items()})
+        return columns
+    # -- flatten() applies the parent's validity, so a missing contract_data gives null contract fields
+    fields = dict(zip([field.name for field in CHAIN_TYPE], chains.flatten()))
+    fields.update(zip(CONTRACT_FIELDS, fields.pop("contract_data").flatten()))
+    names = {**CHAIN_FIELDS, **CONTRACT_FIELDS}
+    return {names[field]: values.to_numpy(zero_copy_only=False) for field, values in fields.items()}
+
+
+def normalize_tvl(payload):
+    assets = (payload or {}).get("data") or []
+    tvls = [asset.get("tvl") or {} for asset in assets]
+    chains_per_asset = np.fromiter(map(len, tvls), dtype=np.int64, count=len(tvls))
+    details = [chain_details for tvl in tvls for chain_details in tvl.values()]
+
+    columns = {}
+    for field, column in ASSET_FIELDS.items():
+        columns[column] = np.repeat(np.array([asset.get(field) for asset in assets], dtype=object), chains_per_asset)
+    columns["Chain"] = [chain for tvl in tvls for chain in tvl]
+    columns.update(_chain_columns(details))
+    df = pd.DataFrame(columns)
+
+    df["Asset ID"] = df["Asset ID"].fillna("")
+    df["Asset Type"] = df["Asset Type"].fillna("")
+    df["Is Abnormal?"] = df["Is Abnormal?"].eq(True)
+    numeric = [column for column in NUMERIC_COLUMNS if column != "TVL (USD)"]
+    df[numeric] = df[numeric].apply(pd.to_numeric, errors="coerce")
+    df["TVL (USD)"] = (df["Total TVL"] * df["Price (USD)"]).round(0)
+    return df[TVL_COLUMNS]
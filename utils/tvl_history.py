@@ -0,0 +1,141 @@
+import os
+import threading
+import time
+
+import pandas as pd
+import streamlit as st
+
+from utils.instrumentation import record_local
+from utils.local_store import cache_path, write_parquet_atomic
+
+# --- TVL History Settings ----------------------------------------------------------------------------------------------------------------------------
+MIN_SNAPSHOT_INTERVAL = 300      # seconds; a fetch this soon after the last snapshot is not recorded again
+RAW_DAYS = 7                     # every snapshot is kept this long,
+HOURLY_DAYS = 90                 # then the last snapshot of each hour, then the last of each day,
+RETENTION_DAYS = 730             # and snapshots older than this are dropped
+COMPACT_INTERVAL = 24 * 3600     # seconds between two downsampling passes
+
+KEY = ["asset", "chain"]
+VALUES = ["tvl_usd", "asset_value"]
+CHANGE_COLUMNS = ["ts", *KEY, *VALUES, "present"]
+SOURCE_COLUMNS = {"Asset ID": "asset", "Chain": "chain", "TVL (USD)": "tvl_usd", "Total Asset Value (USD)": "asset_value"}
+
+
+def _same_values(a, b):
+    # -- NaN (e.g. an asset without a price) equals NaN, so it is not recorded as a change on every snapshot
+    return ((a.to_numpy() == b.to_numpy()) | (a.isna().to_numpy() & b.isna().to_numpy())).all(axis=1)
+
+
+# --- TVL Snapshot History ----------------------------------------------------------------------------------------------------------------------------
+# Every fetched getTVL payload is a snapshot, but most (asset, chain) values do not move between two fetches, so only
+# changes are stored: a row (ts, asset, chain, tvl_usd, asset_value, present) is written when a pair appears, changes, or
+# leaves the payload (present = False). The value of a pair at any snapshot is its last row at or before it.
+# Both tables are Parquet files, where asset and chain are dictionary-encoded. Downsampling keeps fewer snapshot times
+# for older data and folds the changes in between into the kept snapshot that follows them.
+class TvlHistory:
+    name = "tvl_history"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._changes_path = cache_path(self.name, "changes.parquet")
+        self._snapshots_path = cache_path(self.name, "snapshots.parquet")
+        if os.path.exists(self._changes_path) and os.path.exists(self._snapshots_path):
+            self._changes = pd.read_parquet(self._changes_path)
+            self._snapshots = pd.read_parquet(self._snapshots_path)["ts"]
+        else:
+            self._changes = pd.DataFrame({column: pd.Series(dtype=dtype) for column, dtype in
+                                          zip(CHANGE_COLUMNS, ["datetime64[ns]", object, object, float, float, bool])})
+            self._snapshots = pd.Series(dtype="datetime64[ns]", name="ts")
+        self._compacted_at = 0.0
+        latest = self._changes.drop_duplicates(KEY, keep="last")
+        self._state = latest[latest["present"]].set_index(KEY)[VALUES]
+
+    def record(self, tvl, ts=None):
+        # -- tvl is a utils.tvl.normalize_tvl frame; returns whether a snapshot was recorded
+        ts = pd.Timestamp.now().floor("s") if ts is None else pd.Timestamp(ts)
+        current = tvl.rename(columns=SOURCE_COLUMNS)[KEY + VALUES].drop_duplicates(KEY, keep="last").set_index(KEY)
+        with self._lock:
+            if len(self._snapshots) and (ts - self._snapshots.iloc[-1]).total_seconds() < MIN_SNAPSHOT_INTERVAL:
+                return False
+            removed = self._state.index.difference(current.index)
+            snapshot = pd.concat([
+                current.assign(present=True),
+                pd.DataFrame(float("nan"), index=removed, columns=VALUES).assign(present=False),
+            ])
+            known = snapshot.index.isin(self._state.index) & snapshot["present"].to_numpy()
+            unchanged = known & _same_values(snapshot[VALUES], self._state.reindex(snapshot.index))
+            rows = snapshot[~unchanged].reset_index().assign(ts=ts)[CHANGE_COLUMNS]
+
+            self._changes = pd.concat([self._changes, rows], ignore_index=True) if len(self._changes) else rows
+            self._snapshots = pd.concat([self._snapshots, pd.Series([ts], name="ts")], ignore_index=True)
+            self._state = current
+            if time.time() - self._compacted_at > COMPACT_INTERVAL:
+                self._compact(ts)
+            self._save()
+        return True
+
+    def _save(self):
+        write_parquet_atomic(self._changes, self._changes_path)
+        write_parquet_atomic(self._snapshots.to_frame(), self._snapshots_path)
+
+    def _compact(self, now):
+        self._compacted_at = time.time()
+        snapshots = self._snapshots
+        age = now - snapshots
+        hourly = snapshots[(age > pd.Timedelta(days=RAW_DAYS)) & (age <= pd.Timedelta(days=HOURLY_DAYS))]
+        daily = snapshots[(age > pd.Timedelta(days=HOURLY_DAYS)) & (age <= pd.Timedelta(days=RETENTION_DAYS))]
+        kept = pd.concat([
+            daily.groupby(daily.dt.floor("D")).max(),
+            hourly.groupby(hourly.dt.floor("h")).max(),
+            snapshots[age <= pd.Timedelta(days=RAW_DAYS)],
+        ]).sort_values().reset_index(drop=True)
+        if len(kept) == len(snapshots):
+            return
+
+        # -- each change moves to the first kept snapshot at or after it; changes before the oldest kept snapshot fold into it
+        changes = self._changes.copy()
+        position = kept.searchsorted(changes["ts"], side="left").clip(max=len(kept) - 1)
+        changes["ts"] = kept.to_numpy()[position]
+        changes = changes.drop_duplicates(["ts", *KEY], keep="last")
+        # -- a folded row that ends where the pair's previous row was is no longer a change; a pair's first row must be present
+        previous = changes.groupby(KEY, sort=False)[[*VALUES, "present"]].shift()
+        first = previous["present"].isna().to_numpy()
+        same = (_same_values(changes[VALUES], previous[VALUES])
+                & (changes["present"].to_numpy() == previous["present"].fillna(False).to_numpy().astype(bool)))
+        self._changes = changes[(first & changes["present"].to_numpy()) | (~first & ~same)].reset_index(drop=True)
+        self._snapshots = kept
+
+    def series(self, by="chain"):
+        # -- TVL at every snapshot, one column per chain (sum of its assets' TVL) or per asset (the asset's total value)
+        record_local(self.name)
+        with self._lock:
+            changes, snapshots = self._changes, self._snapshots
+        if snapshots.empty:
+            return pd.DataFrame(index=pd.DatetimeIndex([], name="Date"))
+        column = "tvl_usd" if by == "chain" else "asset_value"
+        # -- the value a pair holds from each of its rows on: a pair that left the payload counts 0, like a missing price does
+        rows = changes[["ts", by]].assign(value=changes[column].where(changes["present"], 0.0).fillna(0.0),
+                                          chains=changes["present"].astype(float))
+        # -- each row's change from the pair's previous row; summed per group and accumulated, they give the group's total
+        # -- at every snapshot where one of its pairs changed, without ever expanding the log to every pair at every snapshot
+        previous = rows.groupby([changes["asset"], changes["chain"]], sort=False)[["value", "chains"]].shift(fill_value=0.0)
+        deltas = rows[["value", "chains"]].sub(previous).assign(ts=rows["ts"], group=rows[by])
+        totals = deltas.groupby(["group", "ts"])[["value", "chains"]].sum().groupby(level="group").cumsum()
+        if by == "chain":
+            values = totals["value"]
+        else:
+            # -- an asset's total value is repeated on each of its chains, so it is the mean over the chains it is on
+            values = (totals["value"] / totals["chains"]).where(totals["chains"] > 0.5, 0.0)
+        series = values.unstack("group").reindex(pd.DatetimeIndex(snapshots)).ffill().fillna(0.0)
+        series.columns.name = by
+        series.index.name = "Date"
+        return series
+
+    def stats(self):
+        with self._lock:
+            return {"snapshots": len(self._snapshots), "change_rows": len(self._changes)}
+
+
+@st.cache_resource(show_spinner=False)
+def get_tvl_history():
+    return TvlHistory()
@@ -0,0 +1,105 @@
+import pandas as pd
+import streamlit as st
+
+from utils.local_store import IncrementalStore
+from utils.quantile_sketch import bucket_sql, sketch_quantiles
+from utils.query_templates import query_template, run_template
+
+SUM_COLUMNS = [
+    "tx_count",
+    "fee_count",
+    "fee_sum",
+    "gas_used_sum",
+    "gas_used_count",
+    "gas_wanted_sum",
+    "gas_wanted_count",
+]
+
+
+# --- Daily Rollup of axelar.core.fact_transactions ---------------------------------------------------------------------------------------------------
+# One pass over the new days produces two row sets, told apart by the `sketch` column:
+#   "fee"      - one row per (day, tx_succeeded, fee_denom, fee_bucket); every metric is additive across rows except fee_max
+#   "gas_used" - one row per (day, tx_succeeded, fee_denom, gas_used_bucket); only used as the gas_used quantile sketch
+# Both sets cover every transaction, so totals must only ever be taken over one of them (select() defaults to "fee").
+TX_DAILY_ROLLUP = query_template("tx_daily_rollup", f"""
+    SELECT day,
+           tx_succeeded,
+           fee_denom,
+           fee_bucket,
+           gas_used_bucket,
+           CASE WHEN GROUPING(gas_used_bucket) = 1 THEN 'fee' ELSE 'gas_used' END AS sketch,
+           COUNT(DISTINCT tx_id) AS tx_count,
+           COUNT(fee) AS fee_count,
+           SUM(fee) AS fee_sum,
+           MAX(fee) AS fee_max,
+           SUM(gas_used) AS gas_used_sum,
+           COUNT(gas_used) AS gas_used_count,
+           SUM(gas_wanted) AS gas_wanted_sum,
+           COUNT(gas_wanted) AS gas_wanted_count
+    FROM (
+        SELECT block_timestamp::date AS day,
+               tx_succeeded,
+               fee_denom,
+               tx_id,
+               fee,
+               gas_used,
+               gas_wanted,
+               {bucket_sql("fee")} AS fee_bucket,
+               {bucket_sql("gas_used")} AS gas_used_bucket
+        FROM axelar.core.fact_transactions
+        WHERE block_timestamp::date >= :since
+    )
+    GROUP BY GROUPING SETS ((day, tx_succeeded, fee_denom, fee_bucket),
+                            (day, tx_succeeded, fee_denom, gas_used_bucket))
+    """)
+
+
+class TxRollup(IncrementalStore):
+    name = "tx_daily_rollup_v2"
+
+    def fetch(self, since):
+        df = run_template(TX_DAILY_ROLLUP, ttl=None, since=since)
+        df.columns = [column.lower() for column in df.columns]
+        return df
+
+    def select(self, start_date=None, end_date=None, succeeded=None, fee_denom=None, sketch="fee"):
+        df = self.frame()
+        mask = df["sketch"] == sketch
+        if start_date is not None:
+            mask &= df["day"] >= pd.Timestamp(start_date)
+        if end_date is not None:
+            mask &= df["day"] <= pd.Timestamp(end_date)
+        if succeeded is not None:
+            mask &= df["tx_succeeded"] == succeeded
+        if fee_denom is not None:
+            mask &= df["fee_denom"] == fee_denom
+        return df[mask]
+
+
+@st.cache_resource
+def get_tx_rollup():
+    return TxRollup()
+
+
+# --- Aggregation Helpers -----------------------------------------------------------------------------------------------------------------------------
+def aggregate(rows, by=None):
+    agg = {column: "sum" for column in SUM_COLUMNS}
+    agg["fee_max"] = "max"
+    if by is None:
+        out = rows.agg(agg).to_frame().T.astype(float)
+    else:
+        out = rows.groupby(by, as_index=False).agg(agg)
+
+    out["fee_avg"] = out["fee_sum"] / out["fee_count"].where(out["fee_count"] > 0)
+    out["gas_used_avg"] = out["gas_used_sum"] / out["gas_used_count"].where(out["gas_used_count"] > 0)
+    out["gas_wanted_avg"] = out["gas_wanted_sum"] / out["gas_wanted_count"].where(out["gas_wanted_count"] > 0)
+    return out.iloc[0] if by is None else out
+
+
+def fee_quantiles(rows, qs, by=None):
+    return sketch_quantiles(rows, "fee_bucket", "fee_count", qs, by=by)
+
+
+def gas_used_quantiles(rows, qs, by=None):
+    # -- rows must come from select(..., sketch="gas_used")
+    return sketch_quantiles(rows, "gas_used_bucket", "gas_used_count", qs, by=by)